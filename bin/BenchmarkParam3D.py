@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+import time
+import argparse
+
+import numpy as np
+
+from parageom.common import print_parageom
+from parageom.reader import Param_3D
+
+print_parageom()
+
+# ARGUMENT DEFINITION
+
+parser = argparse.ArgumentParser(
+    description="Time the evaluation of the sections of a blade one call per section and in a single batched call, and check that both give the same coordinates."
+)
+parser.add_argument(
+    "config_file",
+    help="Parablade configuration file of the blade.",
+    type=str,
+)
+parser.add_argument(
+    "-N",
+    "--Nsections",
+    help="number of sections to evaluate",
+    default=181,
+    type=int,
+)
+parser.add_argument(
+    "-n",
+    "--Npoints",
+    help="number of points in each section",
+    default=362,
+    type=int,
+)
+parser.add_argument(
+    "-r",
+    "--repeat",
+    help="number of evaluations timed for each method, the best time is kept",
+    default=3,
+    type=int,
+)
+parser.add_argument(
+    "-c",
+    "--chunk_size",
+    help="number of sections evaluated by each batched call. All of them by default",
+    default=None,
+    type=int,
+)
+
+args = parser.parse_args()
+
+param = Param_3D(args.config_file, args.Nsections, args.Npoints, evaluate=False)
+U = np.broadcast_to(param.u, (param.V.size, param.u.size))
+
+timings = {}
+coordinates = {}
+for name in ("per section", "batched"):
+    timings[name] = np.inf
+    for _ in range(args.repeat):
+        t = time.time()
+        if name == "batched":
+            coordinates[name] = param.evaluate_sections(param.u, param.V, args.chunk_size)
+        else:
+            coordinates[name] = np.array(
+                [param.blade.get_section_coordinates(u, v).T for u, v in zip(U, param.V)]
+            )
+        timings[name] = min(timings[name], time.time() - t)
+
+deviation = np.max(np.abs(coordinates["batched"] - coordinates["per section"]))
+
+print(f"\n\t{args.Nsections} sections of {args.Npoints} points, best of {args.repeat}:")
+for name, my_time in timings.items():
+    print(f"\t\t{name:12s} {my_time:10.5f} s")
+print(f"\t\tspeed-up     {timings['per section'] / timings['batched']:10.2f}")
+print(f"\t\tmaximum difference of the coordinates: {deviation:.3e}\n")
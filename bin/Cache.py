@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+import time
+import argparse
+
+from parageom.common import print_parageom
+from parageom.cache import DiskCache
+
+print_parageom()
+
+# ARGUMENT DEFINITION
+
+parser = argparse.ArgumentParser(
+    description="List or prune the entries of the parageom caches (~/.cache/parageom or $PARAGEOM_CACHE_DIR)."
+)
+parser.add_argument(
+    "names",
+    help="caches to work on.",
+    choices=["geomTurbo", "make_geomTurbo", "match_section"],
+    type=str,
+    nargs="+",
+)
+parser.add_argument(
+    "-p",
+    "--prune",
+    help="Flag to remove the entries instead of listing them",
+    action="count",
+    default=0,
+)
+parser.add_argument(
+    "-a",
+    "--max_age",
+    help="only prune the entries that were not used for this number of days",
+    default=None,
+    type=float,
+)
+parser.add_argument(
+    "-s",
+    "--max_size",
+    help="prune the least recently used entries until the cache fits in this size, in MB",
+    default=None,
+    type=float,
+)
+
+args = parser.parse_args()
+
+for name in args.names:
+    cache = DiskCache(name)
+
+    if args.max_size is not None:
+        cache.evict(int(args.max_size * 1e6))
+    if args.prune:
+        removed = cache.prune(None if args.max_age is None else args.max_age * 86400)
+        print(f"\n\tRemoved {len(removed)} entries from {cache.directory}")
+        continue
+
+    entries = cache.entries()
+    print(f"\n\t{cache.directory}: {len(entries)} entries, {cache.stats()['size'] / 1e6:.1f} MB")
+    for file, size, last_access in entries:
+        print(f"\t\t{time.strftime('%Y-%m-%d %H:%M', time.localtime(last_access))} {size / 1e6:10.3f} MB    {file}")
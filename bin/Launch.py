@@ -50,6 +50,13 @@ parser.add_argument(
     default="xyz",
     type=str,
 )
+parser.add_argument(
+    "-j",
+    "--jobs",
+    help="number of processes matching sections in parallel on the hpc. 0 uses all the cores of the node",
+    default=1,
+    type=int,
+)
 parser.add_argument(
     "-r",
     "--refine3D",
@@ -73,6 +80,7 @@ except:
 
 options["scale_factor"] = args.scale_factor
 options["xyz"] = args.coordinates_order
+options["jobs"] = args.jobs
 
 # initialise everything.
 
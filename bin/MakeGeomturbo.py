@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
 import argparse
+import sys
 
 from parageom.common import print_parageom
-from parageom.functions import make_geomTurbo
+from parageom.functions import make_geomTurbos
 
 print_parageom()
 
@@ -11,8 +12,9 @@ print_parageom()
 parser = argparse.ArgumentParser(description="Build .geomTurbo file from .cfg file")
 parser.add_argument(
     "config_file",
-    help="Parablade configuration file to be used to generate the .geomTurbo file.",
+    help="Parablade configuration file to be used to generate the .geomTurbo file. Several can be inputted at once.",
     type=str,
+    nargs="+",
 )
 parser.add_argument(
     "-o",
@@ -56,16 +58,67 @@ parser.add_argument(
     default="xyz",
     type=str,
 )
+parser.add_argument(
+    "-p",
+    "--precision",
+    help="number of significant digits of the coordinates. By default they are written exactly.",
+    default=None,
+    type=int,
+)
+parser.add_argument(
+    "-s",
+    "--stream",
+    help="Flag to evaluate and write the sections one at a time, to bound memory use for very fine outputs",
+    action="count",
+    default=0,
+)
+parser.add_argument(
+    "-t",
+    "--tolerance",
+    help="maximum chordal deviation of the sections, relative to the length of each side. If set, the points are placed from the curvature and their number is chosen to meet it",
+    default=None,
+    type=float,
+)
+parser.add_argument(
+    "-c",
+    "--cache",
+    help="Flag to reuse the file generated by a previous identical call, from the cache in ~/.cache/parageom/make_geomTurbo",
+    action="count",
+    default=0,
+)
+parser.add_argument(
+    "-b",
+    "--batch",
+    help="Flag to evaluate all the sections in a single parablade call instead of one call per section, checked against the latter on a few sections",
+    action="count",
+    default=0,
+)
+parser.add_argument(
+    "-j",
+    "--jobs",
+    help="number of processes generating the files in parallel when several are inputted. 0 uses all the cores",
+    default=1,
+    type=int,
+)
 
 args = parser.parse_args()
 
 
-make_geomTurbo(
+results = make_geomTurbos(
     args.config_file,
+    jobs=args.jobs or None,
     output_folder=args.output_folder,
     N_sections=args.Nsections,
     N_points=args.Npoints,
     LE_fillet=bool(args.LE_fillet),
     TE_fillet=bool(args.TE_fillet),
     xyz=args.coordinates_order,
+    precision=args.precision,
+    stream=bool(args.stream),
+    tolerance=args.tolerance,
+    cache=bool(args.cache),
+    batch=bool(args.batch),
 )
+
+if any(error is not None for *_, error in results):
+    sys.exit(1)
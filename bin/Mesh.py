@@ -45,6 +45,13 @@ parser.add_argument(
     action="count",
     default=0,
 )
+parser.add_argument(
+    "-j",
+    "--jobs",
+    help="number of processes generating the geomTurbo files in parallel. 0 uses all the cores",
+    type=int,
+    default=1,
+)
 
 
 args = parser.parse_args()
@@ -54,6 +61,7 @@ prepare_mesh_cfg(
     *args.config_file,
     output_dir=args.output_folder,
     row_number=args.row_number,
+    jobs=args.jobs or None,
 )
 
 if args.mesh:
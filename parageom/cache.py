@@ -0,0 +1,237 @@
+import hashlib
+import os
+import tempfile
+import time
+
+import numpy as np
+
+
+DEFAULT_DIR = os.environ.get(
+    "PARAGEOM_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "parageom")
+)
+
+
+class DiskCache:
+    """
+    Size-bounded cache of files stored on disk, one file per entry.
+
+    Entries are named after their key. Their modification time is refreshed each time they
+    are read, so that when the total size of the cache goes over `max_size` (in bytes) the
+    least recently used entries are the ones removed.
+
+    Parameters
+    ----------
+    name : string
+        Name of the sub-directory of `directory` holding the entries.
+    max_size : int, optional
+        Maximum size of the cache in bytes. Default: 1 GB
+    directory : string, optional
+        Root cache directory. Default: $PARAGEOM_CACHE_DIR or ~/.cache/parageom
+    """
+
+    def __init__(self, name, max_size=2**30, directory=None):
+
+        self.directory = os.path.join(DEFAULT_DIR if directory is None else directory, name)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path(self, key, suffix=""):
+        return os.path.join(self.directory, f"{key}{suffix}")
+
+    def get(self, key, suffix=""):
+        """Returns the path to the entry if it exists, None otherwise."""
+        path = self.path(key, suffix)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    def put(self, key, write, suffix=""):
+        """
+        Adds an entry to the cache. `write` is called with the path of a temporary file
+        to fill, which is then atomically moved in place.
+        """
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=f".tmp{suffix}")
+        os.close(fd)
+        try:
+            write(tmp)
+            os.replace(tmp, self.path(key, suffix))
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+        self.evict()
+        return self.path(key, suffix)
+
+    def entries(self):
+        """
+        Lists the entries of the cache from the most to the least recently used.
+
+        Returns:
+            list of (file name, size in bytes, last access time) tuples
+        """
+        entries = []
+        for entry in os.scandir(self.directory):
+            if ".tmp" in entry.name:
+                continue
+            # the entry may be removed by another process meanwhile
+            try:
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((entry.name, stat.st_size, stat.st_mtime))
+        return sorted(entries, key=lambda entry: entry[2], reverse=True)
+
+    def evict(self, max_size=None):
+        """Removes the least recently used entries until the cache fits in `max_size`."""
+        max_size = self.max_size if max_size is None else max_size
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        while entries and total > max_size:
+            name, size, _ = entries.pop()
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def prune(self, max_age=None):
+        """
+        Removes the entries that were not used for `max_age` seconds, or all of them if
+        `max_age` is None.
+
+        Returns:
+            list of the removed entries file names
+        """
+        removed = []
+        for name, _, last_access in self.entries():
+            if max_age is None or time.time() - last_access > max_age:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    continue
+                removed.append(name)
+        return removed
+
+    def stats(self):
+        """Returns the hits and misses counts, number of entries and size of the cache."""
+        entries = self.entries()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(entries),
+            "size": sum(size for _, size, _ in entries),
+        }
+
+
+def file_key(file, *extra):
+    """
+    Cache key of a file: hash of its absolute path and of any other `extra` values the
+    cached result depends on. The file itself is checked against the entry with
+    `file_signature` and `is_current`, so that the key does not need reading it.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(repr((os.path.abspath(file), extra)).encode())
+    return digest.hexdigest()
+
+
+def file_signature(file):
+    """Size, modification time and content hash of a file, to be stored with its entry."""
+    stat = os.stat(file)
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "digest": file_digest(file),
+    }
+
+
+def is_current(file, signature):
+    """
+    Checks that a file still matches the `signature` stored with its entry. The content is
+    only hashed when the size is the same but the modification time changed (eg. after a
+    copy), an unchanged file is checked from its metadata alone.
+
+    Returns:
+        None if the file changed, otherwise the signature, updated if it was hashed
+    """
+    stat = os.stat(file)
+    if stat.st_size != signature["size"]:
+        return None
+    if stat.st_mtime_ns == signature["mtime_ns"]:
+        return signature
+    if file_digest(file) != signature["digest"]:
+        return None
+    return {**signature, "mtime_ns": stat.st_mtime_ns}
+
+
+def file_digest(file):
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file, "rb") as f:
+        for chunk in iter(lambda: f.read(2**24), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def config_key(config, *extra):
+    """
+    Cache key of a parsed configuration: hash of its options in sorted order, with their
+    values normalized to plain python lists, as well as any `extra` values.
+    """
+
+    def _normalize(value):
+        return np.asarray(value).tolist() if not isinstance(value, str) else value
+
+    options = sorted((str(name), _normalize(value)) for name, value in config.items())
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(repr((options, extra)).encode())
+    return digest.hexdigest()
+
+
+def save_arrays(file, **attributes):
+    """
+    Writes arrays, lists of arrays and scalars to an uncompressed .npz file.
+    Attributes set to None are skipped.
+    """
+    arrays = {}
+    for name, value in attributes.items():
+        if value is None:
+            continue
+        elif isinstance(value, list):
+            arrays[f"{name}__len"] = np.array(len(value))
+            for i, element in enumerate(value):
+                arrays[f"{name}__{i}"] = np.asarray(element)
+        else:
+            arrays[name] = np.asarray(value)
+
+    with open(file, "wb") as f:
+        np.savez(f, **arrays)
+
+
+def load_arrays(file):
+    """
+    Reads back a file written with `save_arrays` as a dictionary, 0-d arrays being
+    converted back to scalars.
+    """
+
+    def _unpack(array):
+        return array.item() if array.ndim == 0 else array
+
+    attributes = {}
+    with np.load(file) as data:
+        for name in data.files:
+            if name.endswith("__len"):
+                name = name[: -len("__len")]
+                attributes[name] = [
+                    _unpack(data[f"{name}__{i}"]) for i in range(data[f"{name}__len"])
+                ]
+            elif "__" not in name:
+                attributes[name] = _unpack(data[name])
+    return attributes
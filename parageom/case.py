@@ -1,5 +1,11 @@
 import errno
+import hashlib
 import os
+import re
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from warnings import warn
 
 import numpy as np
@@ -12,6 +18,10 @@ from parablade.blade_match import BladeMatch
 
 from parageom.reader import GeomTurbo
 from parageom.rotor import Rotor
+from parageom.metrics import span_coordinate
+from parageom.sections import select_sections
+from parageom.common import atomic_output
+from parageom.cache import DiskCache, config_key
 
 
 class Case:
@@ -49,12 +59,21 @@ class Case:
         on_hpc :            for running the code on an hpc, will silence the `interactive` option and force `overwrite`
                             off. Default: False
         max_iter_section_number_optim:
-                            number of retries allowed to ensure the right number of sections will be taken. Check the
-                            `match_blade` method for more on how this is used. Default: 1000
+                            no longer used, the sections are now picked directly, see `section_spacing`. Default: 1000
+        section_spacing :   strategy used to pick the sections matched by `match_blade` along the leading edge: 'uniform',
+                            'end-clustered', 'curvature' or 'twist'. Check `parageom.sections.select_sections`.
+                            Default: 'uniform'
         scale_factor :      set the scale factor to that of the .geomTurbo file. eg: 1e-3 for mm.
                             Default: 1e-3
         xyz :               coordinates reordering for the optimization process if necessary. eg: 'zyx', 'xzy', etc...
                             Default: 'xyz'
+        geometry_cache :    keep the parsed .geomTurbo file in the parageom cache directory (~/.cache/parageom or
+                            $PARAGEOM_CACHE_DIR, to be set on clusters where $HOME is limited) so that later cases
+                            on the same file skip parsing. Default: False
+        match_cache :       keep the results of the section optimizations in the parageom cache directory, keyed by the
+                            prescribed section points, the initialised cfg and the `optim_*` options, so that matching
+                            the same section again returns them at once. Sections matched interactively are not
+                            cached. See bin/Cache.py to list and prune the entries. Default: False
         optim_max_iter :    max number of iterations during optimization. Number will be increased if retries are
                             necessary. Default: 300
         optim_convergence_max_dev_rel :
@@ -75,22 +94,32 @@ class Case:
                             match the trailing edge y coordinate. Default: True
         fatten :            fatten the blade profile in the cfg file when initialising for a section. Turn this on in
                             case the optimization yields bad results. Default: False
+        jobs :              number of processes matching sections concurrently in `match_blade`. With more than one,
+                            every `anchor_stride`-th section (and the last one) is matched first, one after the other,
+                            and the remaining sections are then matched in parallel, each starting from the nearest
+                            matched anchor. 0 uses all the cores. Default: 1
+        anchor_stride :     spacing, in number of sections, between the anchor sections of the parallel mode.
+                            Default: 4
+        resume :            skip, when rerunning `match_blade`, the sections whose manifest shows the same inputs (start
+                            cfg, geomTurbo section and options) and a result within the convergence thresholds.
+                            Default: True
 
     """
 
-    DIR = os.getcwd()
-
     defaults = {
         # case parameters
         "interactive": True,
         "overwrite": True,  # allow overwrite
         "auto_concatenate": True,
         "on_hpc": False,  # will force interactive off and overwrite on
-        # small parameter for section number definition
-        "max_iter_section_number_optim": 1000,
+        # section selection parameters
+        "max_iter_section_number_optim": 1000,  # deprecated
+        "section_spacing": "uniform",
         # geomTurbo parameters
         "scale_factor": 1e-3,  # optimization works best if dims are in meters.
         "xyz": "xyz",  # order of the coordinates in the geomTurbo file: chord, thickness, span
+        "geometry_cache": False,
+        "match_cache": False,
         # optimization parameters
         "optim_max_iter": 300,  # max number of iterations for one section
         "optim_convergence_max_dev_rel": 0.4,  # values in % for the convergence criteria.
@@ -101,6 +130,10 @@ class Case:
         "optim_max_retries_slsqp": 1,
         "transfer_position": True,
         "fatten": False,
+        # parallel matching parameters
+        "jobs": 1,
+        "anchor_stride": 4,
+        "resume": True,
     }
 
     def __init__(self, work_dir, geomTurbo_file, **kwargs):
@@ -133,10 +166,17 @@ class Case:
             if key not in Case.defaults:
                 warn(f"`{key}` is not an option and will be ignored.")
 
-        self.geomTurbo = GeomTurbo(geomTurbo_file, self.scale_factor, xyz=self.xyz)
+        self.geomTurbo = GeomTurbo(
+            geomTurbo_file,
+            self.scale_factor,
+            xyz=self.xyz,
+            cache=self.geometry_cache,
+        )
+        # shared by all the sections matched, see `_initialise_cfg`
+        self.rotor = Rotor(self.geomTurbo)
 
         try:
-            os.mkdir(f"{Case.DIR}/{work_dir}")
+            os.mkdir(work_dir)
         except:
             if self.overwrite:
                 print("Will be writing to existing folder.")
@@ -157,7 +197,7 @@ class Case:
                 warn(
                     "Writing results to existing directory but `overwrite` is True, code will proceed."
                 )
-                os.system(f"rm -rf {self.work_dir}/output_matching")
+                sh.rmtree(f"{self.work_dir}/output_matching", ignore_errors=True)
                 # os.system(f"rm -rf {output_path}")
                 # os.mkdir(f"{output_path}/")
                 # os.mkdir(f"{output_path}/residuals/")
@@ -223,7 +263,7 @@ class Case:
             IN["OUT_xyz"] = 'xyz'
         
 
-        _initialise_cfg(IN, self.geomTurbo, self.work_dir, 0, True)
+        _initialise_cfg(IN, self.geomTurbo, self.work_dir, 0, True, rotor=self.rotor)
         cfg.WriteBladeConfigFile(open(IN["Config_Path"], "w"), IN)
 
         if self.interactive:
@@ -238,7 +278,7 @@ class Case:
                 IN,
                 coarseness=1,
                 plot_options=plot_options,
-                _output_path=f"{Case.DIR}/{self.work_dir}",
+                _output_path=os.path.abspath(self.work_dir),
                 _no_subfolder=True,
             )
             optim_object.match_blade(matching_mode="manual")
@@ -250,7 +290,7 @@ class Case:
 
         self.init_config_file = IN["Config_Path"]
 
-    def match_section(self, config_file, section_idx, _match_blade=False):
+    def match_section(self, config_file, section_idx, _match_blade=False, _output_path=None):
 
         """
         Outputs a config file that corresponds to a specified section of the `Case.geomTurbo_file` geometry file from a
@@ -271,11 +311,22 @@ class Case:
         ----------------
         _match_blade : bool, optional
             Not for user. Set to True if called inside `Case.match_blade`.
+        _output_path : string, optional
+            Not for user. Directory in which to write the `output_matching` folder instead of `Case.work_dir`, so
+            that several sections can be matched at once.
+
+        Notes
+        -----
+        With `Case.match_cache`, the matched cfg and optimization progress files are taken from the cache when the
+        same section was already matched from the same cfg with the same options, the paths of the matched cfg being
+        set to those of this case.
         """
 
         IN = cfg.ReadUserInput(config_file)
         name = config_file.split("/")[-1][:-4]
 
+        _output_path = self.work_dir if _output_path is None else _output_path
+
         if name == "section_-01" or not _match_blade:
             _initialise_cfg(
                 IN,
@@ -283,7 +334,8 @@ class Case:
                 self.output_path,
                 section_idx,
                 self.transfer_position,
-                name,
+                name=name,
+                rotor=self.rotor,
             )
         else:
             _initialise_cfg(
@@ -294,8 +346,29 @@ class Case:
                 self.transfer_position,
                 self.fatten,
                 name,
+                rotor=self.rotor,
             )
 
+        optim_options = {
+            key: getattr(self, key) for key in Case.defaults if key.startswith("optim")
+        }
+        output_matching = f"{_output_path}/output_matching"
+
+        # the result of an interactive matching depends on the user
+        cache = None
+        if self.match_cache and (_match_blade or not self.interactive):
+            cache = DiskCache("match_section")
+            key = _match_key(IN, optim_options)
+            cached = [cache.get(key, suffix) for _, suffix in _MATCHING_FILES]
+            if None not in cached:
+                os.makedirs(output_matching, exist_ok=True)
+                for (file, _), path in zip(_MATCHING_FILES, cached):
+                    sh.copyfile(path, f"{output_matching}/{file}")
+                # the cached cfg holds the paths of the case that matched the section first
+                _set_paths(f"{output_matching}/{_MATCHING_FILES[0][0]}", IN)
+                print(f"Section {section_idx} was taken from the cache.")
+                return
+
         if self.interactive:
             plot_options = {
                 "view_xy": "yes",  # 2D Recommended
@@ -317,12 +390,8 @@ class Case:
             IN,
             coarseness=1,
             plot_options=plot_options,
-            _output_path=f"{Case.DIR}/{self.work_dir}",
-            **{
-                f"_{key}": getattr(self, key)
-                for key in Case.defaults
-                if key.startswith("optim")
-            },
+            _output_path=os.path.abspath(_output_path),
+            **{f"_{key}": value for key, value in optim_options.items()},
         )
 
         if self.interactive and not _match_blade:
@@ -332,6 +401,10 @@ class Case:
 
         optim_object.match_blade(matching_mode="DVs")
 
+        if cache is not None:
+            for file, suffix in _MATCHING_FILES:
+                cache.put(key, partial(sh.copyfile, f"{output_matching}/{file}"), suffix)
+
     def match_blade(self, init_config_file=None, N_sections=10):
 
         """ """
@@ -347,56 +420,33 @@ class Case:
                     "Init config file not specified and not " "found in object."
                 )
 
-        # TODO change this try, it's unacceptable
-        try:
-            os.system(f"rm -rf {self.output_path}")
-            os.mkdir(f"{self.output_path}/")
-            os.mkdir(f"{self.output_path}/residuals/")
-        except:
-            pass
+        # results of a previous run are kept so that its converged sections can be skipped, see `resume`
+        os.makedirs(f"{self.output_path}/residuals", exist_ok=True)
+        os.makedirs(f"{self.output_path}/manifests", exist_ok=True)
 
-        le_points = self.geomTurbo.rotor_points[0, :, 0]
-
-        d_min = 100 / (N_sections - 1)
-        sections = _le_lin_sampler(le_points, d_min)
-        n_iter_n_sections = self.max_iter_section_number_optim
-
-        while sections.shape[0] != N_sections and n_iter_n_sections > 0:
-            if sections.shape[0] > N_sections:
-                d_min += d_min * 0.1
-                sections = _le_lin_sampler(le_points, d_min)
-                print(sections.shape)
-            else:
-                d_min -= d_min * 0.1
-                sections = _le_lin_sampler(le_points, d_min)
-                print(sections.shape)
-            n_iter_n_sections -= 1
+        sections = select_sections(
+            self.geomTurbo.rotor_points[0, :, 0],
+            N_sections,
+            self.section_spacing,
+            te_points=self.geomTurbo.rotor_points[0, :, -1],
+        )
 
         json.dump(
             {"geomTurbo_section_indeces": list(np.asarray(sections, dtype=float))},
             open(f"{self.work_dir}/sections.json", "w"),
         )
 
-        sh.copy(init_config_file, f"{self.output_path}/section_{-1:03d}.cfg")
-
-        for i, section_index in enumerate(sections):
+        _remove_sections(self.output_path, sections.shape[0])
 
-            self.match_section(
-                f"{self.output_path}/section_{i-1:03d}.cfg",
-                section_index,
-                _match_blade=True,
-            )
-
-            sh.copy(
-                f"{self.work_dir}/output_matching/matched_parametrization.cfg",
-                f"{self.output_path}/section_{i:03d}.cfg",
-            )
-            sh.copy(
-                f"{self.work_dir}/output_matching/optimization_progress.txt",
-                f"{self.output_path}/residuals/section_{i:03d}_iterations.txt",
-            )
+        sh.copy(init_config_file, f"{self.output_path}/section_{-1:03d}.cfg")
 
-            os.system(f"rm -rf {self.work_dir}/output_matching")
+        if self.jobs == 1:
+            for i, section_index in enumerate(sections):
+                self._match_section_to(
+                    f"{self.output_path}/section_{i-1:03d}.cfg", i, section_index
+                )
+        else:
+            self._match_sections_parallel(sections)
 
         try:
             os.remove(f"{self.output_path}/section_-01.cfg")
@@ -411,7 +461,8 @@ class Case:
         try:
             os.remove(f"{self.output_path}/section_-01.txt")
         except FileNotFoundError:
-            warn("Init prescribed geometry file not found anymore.")
+            # not written again when the first section is resumed
+            pass
         except:
             raise
 
@@ -436,6 +487,119 @@ class Case:
                 final_cfg,
             )
 
+    def _match_sections_parallel(self, sections):
+        """
+        Parallel mode of `match_blade`: the anchor sections are matched one after the other, each starting from the
+        previous anchor, then the other sections are matched in a pool of `Case.jobs` processes, each starting from
+        the anchor nearest in span. The files written are the same as in the sequential mode.
+        """
+        N_sections = len(sections)
+        anchors = sorted(set(range(0, N_sections, max(self.anchor_stride, 1))) | {N_sections - 1})
+        span = span_coordinate(self.geomTurbo.rotor_points[0, :, 0])[sections]
+
+        previous = -1
+        for i in anchors:
+            self._match_section_to(f"{self.output_path}/section_{previous:03d}.cfg", i, sections[i])
+            previous = i
+
+        others = [i for i in range(N_sections) if i not in anchors]
+        nearest = [anchors[np.argmin(np.abs(span[anchors] - span[i]))] for i in others]
+
+        with ProcessPoolExecutor(self.jobs or None) as pool:
+            futures = [
+                pool.submit(
+                    _match_section_job,
+                    self,
+                    f"{self.output_path}/section_{anchor:03d}.cfg",
+                    i,
+                    sections[i],
+                )
+                for i, anchor in zip(others, nearest)
+            ]
+            for future in futures:
+                future.result()
+
+    def _match_section_to(self, config_file, i, section_index):
+        """
+        Matches the geomTurbo section `section_index`, starting from `config_file`, into the files of the `i`th section
+        of `match_blade`. The optimization runs in a scratch directory of its own so that several can run at once, and
+        the results are only moved in place once it has finished. The scratch directory of a failed optimization is
+        left in `Case.work_dir` for inspection.
+
+        A manifest of the run is written to `Case.output_path`/manifests. With `Case.resume`, the matching is skipped if
+        the manifest of a previous run has the same inputs and its result is converged.
+        """
+        config_file_out = f"{self.output_path}/section_{i:03d}.cfg"
+        iterations_file = f"{self.output_path}/residuals/section_{i:03d}_iterations.txt"
+        manifest_file = f"{self.output_path}/manifests/section_{i:03d}.json"
+
+        options = {key: getattr(self, key) for key in Case.defaults if key.startswith("optim")}
+        options.update(
+            scale_factor=self.scale_factor,
+            xyz=self.xyz,
+            transfer_position=self.transfer_position,
+            fatten=self.fatten,
+        )
+        input_hash = self._section_input_hash(config_file, section_index, options)
+
+        if self.resume and self._is_resumable(manifest_file, input_hash, config_file_out, iterations_file):
+            print(f"Section {i} is unchanged and converged, skipping it.")
+            return
+
+        t = time.time()
+        scratch = tempfile.mkdtemp(prefix=f"section_{i:03d}_", dir=self.work_dir)
+
+        # named as the starting file of the sequential mode, which sets the prescribed section file and `fatten`
+        start_file = f"{scratch}/section_{i - 1:03d}.cfg"
+        sh.copy(config_file, start_file)
+        self.match_section(start_file, section_index, _match_blade=True, _output_path=scratch)
+
+        _promote_matching(scratch, config_file_out, iterations_file)
+
+        manifest = {
+            "section": i,
+            "geomTurbo_section": int(section_index),
+            "input_hash": input_hash,
+            "output_hash": _file_hash(config_file_out),
+            "options": options,
+            "residuals": _read_residuals(iterations_file)[-1],
+            "elapsed_time": time.time() - t,
+        }
+        with atomic_output(manifest_file) as tmp:
+            with open(tmp, "w") as f:
+                json.dump(manifest, f, indent=4)
+
+    def _section_input_hash(self, config_file, section_index, options):
+        """Hash of everything the matching of a section depends on."""
+        digest = hashlib.blake2b(digest_size=20)
+        with open(config_file, "rb") as f:
+            digest.update(f.read())
+        for side in range(2):
+            digest.update(np.ascontiguousarray(self.geomTurbo.rotor_points[side][section_index]).tobytes())
+        # a result is checked against the current convergence thresholds instead, see `_is_resumable`
+        options = sorted((key, value) for key, value in options.items() if "convergence" not in key)
+        digest.update(repr((int(section_index), options)).encode())
+        return digest.hexdigest()
+
+    def _is_resumable(self, manifest_file, input_hash, config_file, iterations_file):
+        """
+        Checks that a section matched by a previous run had the same inputs, that its results were not modified since
+        and that they meet the current convergence thresholds.
+        """
+        try:
+            with open(manifest_file, "r") as f:
+                manifest = json.load(f)
+            if manifest["input_hash"] != input_hash or manifest["output_hash"] != _file_hash(config_file):
+                return False
+            residuals = _read_residuals(iterations_file)[-1]
+        except (OSError, ValueError, KeyError, IndexError):
+            return False
+
+        return (
+            residuals[-2] <= self.optim_convergence_mean_dev_rel
+            and residuals[-1] <= self.optim_convergence_max_dev_rel
+        )
+
     def refine(self, mean_deviation_threshold, max_deviation_threshold):
         """This method allows the user to refine the sections that are not well converged enough."""
 
@@ -474,6 +638,7 @@ class Case:
                     self.transfer_position,
                     self.fatten,
                     name=f"new_section_{i:03d}",
+                    rotor=self.rotor,
                 )
 
                 plot_options = {
@@ -483,12 +648,12 @@ class Case:
                     "view_3D": "yes",  # 3D Recommended
                     "error_distribution": "yes",
                 }
-                os.system(f"rm -rf {self.work_dir}/output_matching")
+                scratch = tempfile.mkdtemp(prefix=f"section_{i:03d}_", dir=self.work_dir)
                 optim_object = BladeMatch(
                     IN,
                     coarseness=1,
                     plot_options=plot_options,
-                    _output_path=f"{Case.DIR}/{self.work_dir}",
+                    _output_path=os.path.abspath(scratch),
                     **{
                         f"_{key}": getattr(self, key)
                         for key in Case.defaults
@@ -503,22 +668,11 @@ class Case:
                 optim_object.match_blade(matching_mode="DVs")
                 modded.append(i)
 
-                sh.copy(
-                    f"{self.work_dir}/output_matching/matched_parametrization.cfg",
+                _promote_matching(
+                    scratch,
                     f"{self.output_path}/new_section_{i:03d}.cfg",
-                )
-                try:
-                    os.remove(
-                        f"{self.output_path}/residuals/section_{i:03d}_iterations.txt"
-                    )
-                except:
-                    pass
-
-                sh.copy(
-                    f"{self.work_dir}/output_matching/optimization_progress.txt",
                     f"{self.output_path}/residuals/section_{i:03d}_iterations.txt",
                 )
-                os.system(f"rm -rf {self.work_dir}/output_matching")
 
         answer = ""
         while answer not in ["y", "n", "yes", "no"]:
@@ -526,12 +680,10 @@ class Case:
 
         if answer in ["y", "yes"]:
             for i in modded:
-                os.remove(f"{self.output_path}/section_{i:03d}.cfg")
-                sh.copy(
+                os.replace(
                     f"{self.output_path}/new_section_{i:03d}.cfg",
                     f"{self.output_path}/section_{i:03d}.cfg",
                 )
-                os.remove(f"{self.output_path}/new_section_{i:03d}.cfg")
 
         self.get_residuals()
 
@@ -578,11 +730,12 @@ class Case:
                 "error_distribution": "no",
             }
 
+        scratch = tempfile.mkdtemp(prefix="3D_", dir=self.work_dir)
         o = BladeMatch(
             IN,
             coarseness=1,
             plot_options=plot_options,
-            _output_path=f"{Case.DIR}/{self.work_dir}",
+            _output_path=os.path.abspath(scratch),
             **{
                 f"_{key}": getattr(self, key)
                 for key in Case.defaults
@@ -590,19 +743,18 @@ class Case:
             },
         )
         o.match_blade("DVs")
-        # TODO finish copying the file back to where it needs to be
-        # sh.copy(f'{self.work_dir}/output_matching/')
+
+        _promote_matching(
+            scratch,
+            f"{self.work_dir}/3D_matched_parametrization.cfg",
+            f"{self.work_dir}/3D_iterations.txt",
+        )
 
     def get_residuals(self, print_residuals=True):
         residuals = []
         for file in sorted(os.listdir(f"{self.output_path}/residuals")):
             if file.endswith("s.txt"):
-                with open(f"{self.output_path}/residuals/{file}", "r") as f:
-                    data = list(
-                        map(lambda x: x.rstrip("\n").split(" \t "), f.readlines()[1:])
-                    )
-                    data = list(map(lambda x: list(map(lambda y: float(y), x)), data))
-                residuals.append(data)
+                residuals.append(_read_residuals(f"{self.output_path}/residuals/{file}"))
 
         if print_residuals:
             print(
@@ -626,6 +778,7 @@ def _initialise_cfg(
     transfer_position=True,
     fatten=False,
     name=None,
+    rotor=None,
 ):
 
     if transfer_position:
@@ -637,7 +790,7 @@ def _initialise_cfg(
 
     name = "init" if name is None else name
 
-    rotor = Rotor(geomTurbo)
+    rotor = Rotor(geomTurbo) if rotor is None else rotor
     rotor.parablade_section_export(
         section_idx,
         file=f"{output_path}/{name}.txt",
@@ -645,8 +798,8 @@ def _initialise_cfg(
     )
 
     IN["NDIM"] = [2]
-    IN["Config_Path"] = f"{Case.DIR}/{output_path}/{name}.cfg"
-    IN["PRESCRIBED_BLADE_FILENAME"] = f"{Case.DIR}/{output_path}/{name}.txt"
+    IN["Config_Path"] = os.path.abspath(f"{output_path}/{name}.cfg")
+    IN["PRESCRIBED_BLADE_FILENAME"] = os.path.abspath(f"{output_path}/{name}.txt")
 
     if "SCALE_FACTOR" in IN and IN["SCALE_FACTOR"] != geomTurbo.scale_factor:
         IN = cfg.Scale(IN, scale=geomTurbo.scale_factor, in_place=True)
@@ -654,15 +807,74 @@ def _initialise_cfg(
         IN = cfg.Scale(IN, scale=geomTurbo.scale_factor, in_place=True)
 
 
-def _le_lin_sampler(le_points, d_min):
-    indeces = [0]
-    last = le_points[0]
-    limit = (d_min * 0.01) * np.sum(
-        np.linalg.norm(le_points[1:] - le_points[:-1], axis=1)
+def _promote_matching(scratch, config_file, iterations_file):
+    """
+    Moves the matched cfg and the optimization progress of the `BladeMatch` run in `scratch` to their destinations,
+    each with an atomic rename as `scratch` is on the same filesystem, then removes `scratch`.
+    """
+    os.replace(f"{scratch}/output_matching/matched_parametrization.cfg", config_file)
+    os.replace(f"{scratch}/output_matching/optimization_progress.txt", iterations_file)
+    sh.rmtree(scratch)
+
+
+# files of a `BladeMatch` output_matching folder kept by the match_section cache, and their suffixes in the cache
+_MATCHING_FILES = (
+    ("matched_parametrization.cfg", ".cfg"),
+    ("optimization_progress.txt", ".txt"),
+)
+
+# options of a cfg that depend on where the case is, left out of the match_section cache key
+_PATH_KEYS = ("Config_Path", "PRESCRIBED_BLADE_FILENAME")
+
+
+def _match_key(IN, optim_options):
+    """
+    Cache key of a section optimization: the prescribed section points, the initialised cfg without its paths, and the
+    optimization options.
+    """
+    config = {key: value for key, value in IN.items() if key not in _PATH_KEYS}
+    return config_key(
+        config, _file_hash(IN["PRESCRIBED_BLADE_FILENAME"]), sorted(optim_options.items())
     )
-    for i in range(1, le_points.shape[0]):
-        if np.linalg.norm(le_points[i] - last) > limit:
-            last = le_points[i]
-            indeces.append(i)
-    indeces.append(le_points.shape[0] - 1)
-    return np.array(indeces)
+
+
+def _set_paths(config_file, IN):
+    """Sets the paths of the cfg `config_file`, taken from the match_section cache, to those of `IN`."""
+    matched = cfg.ReadUserInput(config_file)
+    for key in _PATH_KEYS:
+        matched[key] = IN[key]
+    with open(config_file, "w") as f:
+        cfg.WriteBladeConfigFile(f, matched)
+
+
+def _read_residuals(file):
+    """Rows of an optimization_progress.txt file: iteration, mean and max deviations in m and in %."""
+    with open(file, "r") as f:
+        data = list(map(lambda x: x.rstrip("\n").split(" \t "), f.readlines()[1:]))
+    return list(map(lambda x: list(map(lambda y: float(y), x)), data))
+
+
+def _file_hash(file):
+    with open(file, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=20).hexdigest()
+
+
+def _remove_sections(output_path, N_sections):
+    """Removes the files of the sections numbered `N_sections` and above, left by a previous run with more sections."""
+    pattern = re.compile(r"section_(\d{3})")
+    for folder in (output_path, f"{output_path}/residuals", f"{output_path}/manifests"):
+        for file in os.listdir(folder):
+            match = pattern.match(file)
+            if match is None:
+                continue
+            # the prescribed geometry of a section is written under the number of the previous one
+            number = int(match.group(1)) + (folder == output_path and file.endswith(".txt"))
+            if number >= N_sections:
+                os.remove(f"{folder}/{file}")
+
+
+def _match_section_job(case, config_file, i, section_index):
+    # no plots can be shown from the worker processes
+    case.interactive = False
+    case._match_section_to(config_file, i, section_index)
+
@@ -2,6 +2,8 @@ import matplotlib.pyplot as plt
 import numpy as np
 import os
 import errno
+import tempfile
+from contextlib import contextmanager
 from warnings import warn
 
 
@@ -29,6 +31,44 @@ def make_output_folder(path, overwrite=True, warning=True):
             raise
 
 
+@contextmanager
+def atomic_output(path):
+    """
+    Yields a temporary path next to `path`, which is moved to `path` once the block exits
+    without error and removed otherwise. Readers of `path` never see a partial file.
+    """
+    fd, tmp = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(path)), suffix=f".tmp{os.path.splitext(path)[1]}"
+    )
+    os.close(fd)
+    try:
+        yield tmp
+        # mkstemp creates the file readable by its owner only
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp, 0o666 & ~umask)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def interp_rows(x, xp, fp):
+    """
+    np.interp applied row by row, x and xp being of shape (N_rows, N) with increasing
+    rows, and fp either of the shape of xp or of shape (N,), shared by all the rows.
+    x is clipped to the range of its own row, so that as with np.interp the values out
+    of it get the first or last value of fp of that row, and the rows are shifted past
+    one another so that a single call does the job.
+    """
+    xp = np.asarray(xp, dtype="float")
+    x = np.clip(x, xp[:, :1], xp[:, -1:])
+    shift = (np.max(xp[:, -1] - xp[:, 0]) + 1) * np.arange(xp.shape[0])[:, np.newaxis]
+    shift = shift - xp[:, :1]
+    fp = np.broadcast_to(fp, xp.shape)
+    return np.interp(x + shift, (xp + shift).ravel(), fp.ravel()).reshape(x.shape)
+
+
 def _getlines(file, separator=" "):
     with open(file, "r") as f:
         data = [
@@ -0,0 +1,500 @@
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy.spatial import cKDTree
+from parablade.common.config import ConfigPasser, DeScale
+
+from parageom.metrics import span_coordinate
+from parageom.reader import GeomTurbo, Param_3D, _split_sections, _xyz_order
+
+
+class SurfaceIndex:
+    """
+    Spatial index of the surface of a blade, to compute exact point-to-surface distances.
+
+    Both sides of the geometry are triangulated, two triangles per cell of the point
+    grids. The distance of a point to the cells around its nearest grid point bounds its
+    distance to the surface, and most often is that distance already. Only the triangles
+    whose centroid lies within that bound plus their own size, and whose bounding box is
+    within the bound, can then hold a closer point. As the cells of a blade grid vary a
+    lot in size, the triangles are grouped by size with one KD-tree of centroids per
+    group, so that the search radius of each group stays tight.
+
+    The index can be kept and reused to compare many candidates to the same reference.
+
+    Parameters
+    ----------
+    geometry :
+        Anything accepted by `rotor_points`.
+    """
+
+    def __init__(self, geometry, **kwargs):
+
+        self.rotor_points = rotor_points(geometry, **kwargs)
+        sides = [np.asarray(side, dtype="float") for side in self.rotor_points]
+        self.triangles, self.valid = _triangulate(sides)
+        self.lower_corners = self.triangles.min(axis=1)
+        self.upper_corners = self.triangles.max(axis=1)
+        self.vertex_tree = cKDTree(np.concatenate([side.reshape((-1, 3)) for side in sides]))
+
+        # grid shape, first vertex and first triangle of each side in the flat arrays
+        self.shapes = np.array([side.shape[:2] for side in sides])
+        self._vertex_offsets = np.cumsum([0, *np.prod(self.shapes, axis=1)])
+        self._triangle_offsets = np.cumsum([0, *(2 * np.prod(self.shapes - 1, axis=1))])
+
+        # groups by powers of 2 of the size, distance from the centroid to the furthest vertex
+        # only the non degenerate triangles are searched
+        centroids = self.triangles.mean(axis=1)
+        sizes = np.max(np.linalg.norm(self.triangles - centroids[:, np.newaxis], axis=2), axis=1)
+        groups = np.ceil(np.log2(np.maximum(sizes / np.max(sizes, initial=0), 2.0**-30)))
+        self.groups = []
+        for group in np.unique(groups[self.valid]):
+            members = np.nonzero((groups == group) & self.valid)[0]
+            self.groups.append((members, cKDTree(centroids[members]), np.max(sizes[members])))
+
+    def distances(self, points, chunk_size=2**14, workers=1):
+        """
+        Distances from points of shape (..., 3) to the surface, computed `chunk_size`
+        points at a time to bound memory use. `workers` is passed on to the KD-tree
+        queries, -1 uses all the cores.
+        """
+        points = np.asarray(points, dtype="float")
+        flat = points.reshape((-1, 3))
+        distances = np.empty(flat.shape[0])
+
+        for i in range(0, flat.shape[0], chunk_size):
+            distances[i : i + chunk_size] = self._chunk_distances(
+                flat[i : i + chunk_size], workers
+            )
+
+        return distances.reshape(points.shape[:-1])
+
+    def nearest_sections(self, points, workers=1):
+        """Index of the section of the grid point nearest to each of `points`."""
+        _, vertices = self.vertex_tree.query(np.asarray(points, dtype="float"), workers=workers)
+        side = np.searchsorted(self._vertex_offsets, vertices, side="right") - 1
+        return (vertices - self._vertex_offsets[side]) // self.shapes[side, 1]
+
+    def _chunk_distances(self, points, workers):
+
+        # the nearest vertex bounds the distance when all the triangles around it are
+        # degenerate
+        bound, vertices = self.vertex_tree.query(points, workers=workers)
+        cells = self._cells_around(vertices)
+        distances = _triangle_distances(
+            points[:, np.newaxis], np.moveaxis(self.triangles[cells], -2, 0)
+        )
+        bound = np.minimum(
+            bound, np.min(distances, axis=1, initial=np.inf, where=self.valid[cells])
+        )
+
+        for members, tree, size in self.groups:
+            candidates = tree.query_ball_point(points, bound + size, workers=workers)
+            counts = np.fromiter(map(len, candidates), dtype="int", count=points.shape[0])
+            if not counts.any():
+                continue
+            point_ids = np.repeat(np.arange(points.shape[0]), counts)
+            triangle_ids = members[np.concatenate(candidates).astype("int")]
+
+            # only the triangles whose bounding box is within the bound
+            outside = np.maximum(
+                np.maximum(self.lower_corners[triangle_ids] - points[point_ids], 0),
+                points[point_ids] - self.upper_corners[triangle_ids],
+            )
+            near = np.einsum("ij,ij->i", outside, outside) < bound[point_ids] ** 2
+            point_ids, triangle_ids = point_ids[near], triangle_ids[near]
+
+            np.fmin.at(
+                bound,
+                point_ids,
+                _triangle_distances(
+                    points[point_ids], np.moveaxis(self.triangles[triangle_ids], -2, 0)
+                ),
+            )
+
+        return bound
+
+    def _cells_around(self, vertices):
+        """Indices of the 8 triangles of the 4 cells around grid points, of shape (N, 8)."""
+        side = np.searchsorted(self._vertex_offsets, vertices, side="right") - 1
+        N_sections, N_points = self.shapes[side, 0, None, None], self.shapes[side, 1, None, None]
+        row, column = np.divmod(vertices - self._vertex_offsets[side], N_points[:, 0, 0])
+
+        offsets = np.array([-1, 0])
+        rows = np.clip(row[:, None, None] + offsets[:, None], 0, N_sections - 2)
+        columns = np.clip(column[:, None, None] + offsets, 0, N_points - 2)
+        first = self._triangle_offsets[side, None, None] + rows * (N_points - 1) + columns
+
+        # the second triangles of the cells come after all the first ones of the side
+        second = first + (N_sections - 1) * (N_points - 1)
+        return np.stack((first, second), axis=-1).reshape((vertices.shape[0], -1))
+
+
+def compare(
+    reference, candidate, percentiles=(50, 90, 95, 99), symmetric=True, workers=1, **kwargs
+):
+    """
+    Deviation of a candidate blade from a reference one.
+
+    The points of the candidate are projected on the surface of the reference. With
+    `symmetric=True` the points of the reference are also projected on the candidate,
+    for the Hausdorff distance.
+
+    Parameters
+    ----------
+    reference, candidate :
+        `SurfaceIndex`, or anything accepted by `rotor_points`. Passing a `SurfaceIndex`
+        of the reference avoids rebuilding it for every candidate of a sweep.
+    workers : int, optional
+        Passed on to `SurfaceIndex.distances`.
+    **kwargs :
+        Passed on to `rotor_points` for the geometries that are not indexed yet.
+
+    Returns:
+        dictionary with the mean, rms and max distances, the `percentiles`, the mean
+        and max distances of every section of the candidate, the Hausdorff distance
+        (None if not symmetric) and all the distances with the shape of the candidate
+        rotor points
+    """
+    if not isinstance(reference, SurfaceIndex):
+        reference = SurfaceIndex(reference, **kwargs)
+    if isinstance(candidate, SurfaceIndex):
+        candidate_points = candidate.rotor_points
+    else:
+        candidate_points = rotor_points(candidate, **kwargs)
+
+    distances = reference.distances(candidate_points, workers=workers)
+    flat = distances.ravel()
+
+    hausdorff = None
+    if symmetric:
+        if not isinstance(candidate, SurfaceIndex):
+            candidate = SurfaceIndex(candidate_points)
+        hausdorff = max(
+            flat.max(), candidate.distances(reference.rotor_points, workers=workers).max()
+        )
+
+    return {
+        "mean": flat.mean(),
+        "rms": np.sqrt(np.mean(flat**2)),
+        "max": flat.max(),
+        "percentiles": dict(zip(percentiles, np.percentile(flat, percentiles))),
+        "section_mean": distances.mean(axis=(0, 2)),
+        "section_max": distances.max(axis=(0, 2)),
+        "hausdorff": hausdorff,
+        "distances": distances,
+    }
+
+
+def compare_scan(
+    scan_file,
+    nominal,
+    jobs=None,
+    chunk_size=2**20,
+    bins=200,
+    max_distance=None,
+    N_span_bins=20,
+    columns=(0, 1, 2),
+    dtype=None,
+    **kwargs,
+):
+    """
+    Deviation of a large unstructured point cloud, typically an inspection scan, from a
+    nominal blade, without loading the whole scan in memory.
+
+    The scan is split in chunks of about `chunk_size` points, read and compared to the
+    nominal surface by a pool of `jobs` processes (all the cores if None), each process
+    holding its own `SurfaceIndex`. Only the histogram of the distances and the
+    statistics per span bin are accumulated.
+
+    Parameters
+    ----------
+    scan_file : string
+        Either a text file with one point per line, separated by spaces, tabs or commas,
+        lines starting with # being skipped; a .npy file of shape (N, N_columns); or a
+        raw binary file of records of 3 values of `dtype`. The coordinates are taken from
+        `columns` in all three cases.
+    nominal :
+        `SurfaceIndex` or anything accepted by `rotor_points`, in the same units and
+        coordinate order as the scan.
+    bins : int or array, optional
+        Number of bins of the histogram between 0 and `max_distance`, or bin edges.
+        `max_distance` defaults to 5% of the size of the nominal blade, the distances
+        above it are counted in the last bin.
+    N_span_bins : int, optional
+        Number of span bins of the statistics, the span of a point being that of the
+        nominal section nearest to it.
+    **kwargs :
+        Passed on to `rotor_points`.
+
+    Returns:
+        dictionary with the count, mean, rms and max distance, the histogram and its
+        bin edges, and the span bin edges with the count, mean, rms and max distance of
+        each span bin, with a count of 0 and NaN statistics for an empty scan
+    """
+    t = time.time()
+    index = nominal if isinstance(nominal, SurfaceIndex) else SurfaceIndex(nominal, **kwargs)
+
+    if np.ndim(bins) == 0:
+        if max_distance is None:
+            max_distance = 0.05 * np.max(np.ptp(index.vertex_tree.data, axis=0))
+        bins = np.linspace(0, max_distance, bins + 1)
+    span_bins = np.linspace(0, 1, N_span_bins + 1)
+
+    tasks = [
+        (scan_file, start, end, columns, dtype, bins, span_bins)
+        for start, end in _scan_ranges(scan_file, chunk_size, dtype)
+    ]
+    if jobs == 1:
+        span = _scan_span(index)
+        results = [_compare_scan_chunk(task, index, span) for task in tasks]
+    else:
+        with ProcessPoolExecutor(
+            jobs, initializer=_init_scan_worker, initargs=(index.rotor_points,)
+        ) as pool:
+            results = list(pool.map(_compare_scan_worker_chunk, tasks))
+
+    histogram = np.zeros(bins.size - 1, dtype="int")
+    span_stats = np.zeros((4, span_bins.size - 1))
+    for chunk_histogram, chunk_stats in results:
+        histogram += chunk_histogram
+        span_stats[:3] += chunk_stats[:3]
+        span_stats[3] = np.maximum(span_stats[3], chunk_stats[3])
+    count, total, squares, maximum = span_stats
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        report = {
+            "count": int(count.sum()),
+            "mean": total.sum() / count.sum(),
+            "rms": np.sqrt(squares.sum() / count.sum()),
+            "max": maximum.max() if count.sum() > 0 else np.nan,
+            "histogram": histogram,
+            "bin_edges": bins,
+            "span_edges": span_bins,
+            "span_count": count.astype("int"),
+            "span_mean": total / count,
+            "span_rms": np.sqrt(squares / count),
+            "span_max": np.where(count > 0, maximum, np.nan),
+        }
+    print(
+        f"Compared {report['count']} points in %(my_time).5f seconds\n"
+        % {"my_time": time.time() - t}
+    )
+    return report
+
+
+def rotor_points(geometry, N_sections=181, N_points=362, xyz="xyz"):
+    """
+    Rotor points of shape (2, N_sections, N_points, 3), in the order of the sides and
+    coordinates of a geomTurbo file, of:
+
+        - a `GeomTurbo`, or the path to a .geomTurbo file,
+        - a `Param_3D`, or the path to a .cfg file evaluated with `N_sections` and
+          `N_points`, the coordinates being ordered as in a geomTurbo file written with
+          `xyz`,
+        - or an array of that shape.
+    """
+    if isinstance(geometry, str) and geometry.endswith(".cfg"):
+        IN = ConfigPasser(geometry)
+        DeScale(IN, in_place=True)
+        geometry = Param_3D(IN, N_sections=N_sections, N_points=N_points)
+    elif isinstance(geometry, str):
+        geometry = GeomTurbo(geometry, "sectioned")
+
+    if isinstance(geometry, GeomTurbo):
+        return np.asarray(geometry.rotor_points, dtype="float")
+    if isinstance(geometry, Param_3D):
+        if geometry.split_coordinates is None:
+            split = _split_sections(np.array(geometry.blade_coordinates))
+        else:
+            split = geometry.split_coordinates
+        return np.swapaxes(split, 0, 1)[..., _xyz_order(xyz)]
+    return np.asarray(geometry, dtype="float")
+
+
+# Functions used in compare_scan, run in the worker processes.
+
+# state of the worker processes, set once by _init_scan_worker
+_worker_index = None
+_worker_span = None
+
+
+def _init_scan_worker(rotor_points):
+    global _worker_index, _worker_span
+    _worker_index = SurfaceIndex(rotor_points)
+    _worker_span = _scan_span(_worker_index)
+
+
+def _compare_scan_worker_chunk(task):
+    return _compare_scan_chunk(task, _worker_index, _worker_span)
+
+
+def _scan_span(index):
+    """Span coordinate of the sections of the nominal surface."""
+    return span_coordinate(np.asarray(index.rotor_points[0])[:, 0])
+
+
+def _scan_ranges(scan_file, chunk_size, dtype):
+    """
+    Splits a scan file in byte ranges of about `chunk_size` points. The ranges of text
+    files end on line breaks, the ones of binary files on whole records.
+    """
+    size = os.path.getsize(scan_file)
+
+    if scan_file.endswith(".npy"):
+        points = np.load(scan_file, mmap_mode="r")
+        N = points.shape[0]
+        return [(i, min(i + chunk_size, N)) for i in range(0, N, chunk_size)]
+    if dtype is not None:
+        record = np.dtype(dtype).itemsize * 3
+        step = record * chunk_size
+        return [(i, min(i + step, size)) for i in range(0, size, step)]
+
+    # about 60 bytes per line in text files
+    step = 60 * chunk_size
+    ranges = []
+    start = 0
+    with open(scan_file, "rb") as f:
+        while start < size:
+            f.seek(min(start + step, size))
+            f.readline()
+            end = min(f.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+_COMMENT_LINE = re.compile(rb"#[^\n]*")
+
+
+def _read_scan_chunk(scan_file, start, end, columns, dtype):
+    if scan_file.endswith(".npy"):
+        points = np.load(scan_file, mmap_mode="r")[start:end]
+        return np.asarray(points[:, list(columns)], dtype="float")
+
+    with open(scan_file, "rb") as f:
+        f.seek(start)
+        block = f.read(end - start)
+
+    if dtype is not None:
+        points = np.frombuffer(block, dtype=dtype).reshape((-1, 3))
+        return points[:, list(columns)].astype("float")
+
+    block = _COMMENT_LINE.sub(b"", block).replace(b",", b" ")
+    first_line = block.lstrip().split(b"\n", 1)[0]
+    N_columns = len(first_line.split())
+    if N_columns == 0:
+        # empty or only comments
+        return np.empty((0, len(columns)))
+    values = np.fromstring(block.decode(), sep=" ")
+    return values.reshape((-1, N_columns))[:, list(columns)]
+
+
+def _compare_scan_chunk(task, index, scan_span):
+    scan_file, start, end, columns, dtype, bins, span_bins = task
+    points = _read_scan_chunk(scan_file, start, end, columns, dtype)
+    N_span_bins = span_bins.size - 1
+    if points.shape[0] == 0:
+        return np.zeros(bins.size - 1, dtype="int"), np.zeros((4, N_span_bins))
+
+    distances = index.distances(points)
+    histogram, _ = np.histogram(np.minimum(distances, bins[-1]), bins)
+
+    span = scan_span[index.nearest_sections(points)]
+    span_bin = np.clip(np.searchsorted(span_bins, span, side="right") - 1, 0, span_bins.size - 2)
+    maximum = np.zeros(N_span_bins)
+    np.maximum.at(maximum, span_bin, distances)
+    span_stats = np.array(
+        [
+            np.bincount(span_bin, minlength=N_span_bins),
+            np.bincount(span_bin, distances, minlength=N_span_bins),
+            np.bincount(span_bin, distances**2, minlength=N_span_bins),
+            maximum,
+        ]
+    )
+    return histogram, span_stats
+
+
+# Functions used in SurfaceIndex.
+
+
+def _triangulate(rotor_points):
+    """
+    Triangles of shape (N_triangles, 3, 3), two per quad of the grid of each side, and
+    whether each of them is non degenerate. The degenerate ones, eg. at a collapsed
+    trailing edge, are kept so that the triangles follow the grid, but must be left out
+    as `_closest_point_on_triangle` gives NaN for them.
+    """
+    triangles = []
+    for side in rotor_points:
+        side = np.asarray(side, dtype="float")
+        a, b = side[:-1, :-1], side[:-1, 1:]
+        c, d = side[1:, :-1], side[1:, 1:]
+        triangles.append(np.stack((a, b, d), axis=-2).reshape((-1, 3, 3)))
+        triangles.append(np.stack((a, d, c), axis=-2).reshape((-1, 3, 3)))
+    triangles = np.concatenate(triangles)
+
+    # twice the area against the product of two sides, ie. the sine of their angle
+    ab, ac = triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0]
+    area = np.linalg.norm(np.cross(ab, ac), axis=1)
+    scale = np.linalg.norm(ab, axis=1) * np.linalg.norm(ac, axis=1)
+    return triangles, area > 16 * np.finfo(float).eps * scale
+
+
+def _triangle_distances(points, triangles):
+    """Distances from points to triangles given as arrays of vertices a, b, c."""
+    a, b, c = triangles
+    return np.linalg.norm(_closest_point_on_triangle(points, a, b, c) - points, axis=-1)
+
+
+def _dot(u, v):
+    return np.einsum("...i,...i->...", u, v)
+
+
+def _closest_point_on_triangle(p, a, b, c):
+    """
+    Closest points of triangles (a, b, c) to points p, all broadcast together, following
+    the Voronoi regions of the triangle as in Ericson, Real-Time Collision Detection,
+    5.1.5. Degenerate triangles give NaN.
+    """
+    ab, ac, ap = b - a, c - a, p - a
+    d1, d2 = _dot(ab, ap), _dot(ac, ap)
+    bp = p - b
+    d3, d4 = _dot(ab, bp), _dot(ac, bp)
+    cp = p - c
+    d5, d6 = _dot(ab, cp), _dot(ac, cp)
+
+    va = d3 * d6 - d5 * d4
+    vb = d5 * d2 - d1 * d6
+    vc = d1 * d4 - d3 * d2
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # the regions are applied from the least to the most specific test
+        denominator = va + vb + vc
+        closest = a + ab * (vb / denominator)[..., None] + ac * (vc / denominator)[..., None]
+
+        w = (d4 - d3) / ((d4 - d3) + (d5 - d6))
+        region = (va <= 0) & (d4 - d3 >= 0) & (d5 - d6 >= 0)
+        closest = np.where(region[..., None], b + (c - b) * w[..., None], closest)
+
+        w = d2 / (d2 - d6)
+        region = (vb <= 0) & (d2 >= 0) & (d6 <= 0)
+        closest = np.where(region[..., None], a + ac * w[..., None], closest)
+
+        region = (d6 >= 0) & (d5 <= d6)
+        closest = np.where(region[..., None], c, closest)
+
+        v = d1 / (d1 - d3)
+        region = (vc <= 0) & (d1 >= 0) & (d3 <= 0)
+        closest = np.where(region[..., None], a + ab * v[..., None], closest)
+
+        region = (d3 >= 0) & (d4 <= d3)
+        closest = np.where(region[..., None], b, closest)
+
+        region = (d1 <= 0) & (d2 <= 0)
+        closest = np.where(region[..., None], a, closest)
+
+    return closest
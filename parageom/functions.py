@@ -1,6 +1,8 @@
 import os
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial, lru_cache
 
 import matplotlib.pyplot as plt
 import numpy as np
@@ -19,9 +21,11 @@ from parablade.common.config import (
 )
 
 from parageom.reader import Param_3D, GeomTurbo
-from parageom.rotor import Rotor
+from parageom.rotor import Rotor, span_weights
+from parageom.metrics import span_coordinate
 import parageom.meshing as ms
-from parageom.common import make_output_folder
+from parageom.common import make_output_folder, atomic_output
+from parageom.cache import DiskCache, config_key, file_digest
 
 
 # This file stores the functions used for the scripts available in bin/
@@ -33,7 +37,23 @@ def make_geomTurbo(
     LE_fillet=False,
     TE_fillet=False,
     xyz=None,
+    precision=None,
+    stream=False,
+    tolerance=None,
+    cache=False,
+    batch=False,
 ):
+    """
+    With `cache` set to True (or to a `DiskCache`), the generated files are kept in
+    ~/.cache/parageom/make_geomTurbo, keyed by the cfg contents, the output options and the
+    source of parageom.reader, and copied over instead of being generated again for
+    identical requests.
+
+    With `batch`, the sections are evaluated in a single parablade call instead of one
+    per section, see `Param_3D`.
+
+    The file is written under a temporary name and renamed once complete.
+    """
     DIR = os.getcwd()
 
     t = time.time()
@@ -55,17 +75,130 @@ def make_geomTurbo(
         except:
             raise
 
-    blade = Param_3D(IN, N_sections=N_sections, N_points=N_points)
-    blade.output_geomTurbo(
-        f"{DIR}/{output_folder}/{config_file.split('/')[-1][:-3]}geomTurbo",
-        LE_fillet,
-        TE_fillet,
-        xyz=xyz,
+    output_file = f"{DIR}/{output_folder}/{config_file.split('/')[-1][:-3]}geomTurbo"
+
+    if cache:
+        cache = DiskCache("make_geomTurbo") if cache is True else cache
+        key = config_key(
+            IN,
+            N_sections,
+            N_points,
+            bool(LE_fillet),
+            bool(TE_fillet),
+            xyz,
+            precision,
+            tolerance,
+            _generator_digest(),
+        )
+        cached = cache.get(key, ".geomTurbo")
+        if cached is not None:
+            with atomic_output(output_file) as tmp:
+                sh.copyfile(cached, tmp)
+            print(
+                "This was copied from the cache in %(my_time).5f seconds (%(hits)d hits, %(misses)d misses)\n"
+                % {"my_time": time.time() - t, **cache.stats()}
+            )
+            return output_file
+
+    # with a tolerance, N_points is only the base of the dense sampling of the sections.
+    blade = Param_3D(
+        IN,
+        N_sections=N_sections,
+        N_points=N_points,
+        evaluate=not stream,
+        tolerance=tolerance,
+        batch=batch,
     )
+    # streaming evaluates and writes one section at a time, for very fine outputs.
+    output = blade.stream_geomTurbo if stream else blade.output_geomTurbo
+    with atomic_output(output_file) as tmp:
+        output(tmp, LE_fillet, TE_fillet, xyz=xyz, precision=precision)
+
+    if cache:
+        cache.put(key, lambda tmp: sh.copyfile(output_file, tmp), ".geomTurbo")
+
+    print(
+        "This was generated in %(my_time).5f seconds\n" % {"my_time": time.time() - t}
+    )
+    return output_file
+
+
+def make_geomTurbos(config_files, jobs=1, **kwargs):
+    """
+    Runs `make_geomTurbo` for each of `config_files`, in a pool of `jobs` processes (all
+    the cores if None). The other arguments are passed on to `make_geomTurbo`.
+
+    A failing config does not stop the others, its error is reported in the summary
+    printed at the end.
+
+    With `cache`, a single `DiskCache` is used for all the files, whose hits and misses
+    in all the processes are added up and printed in the summary.
+
+    Returns:
+        list of (config file, output file or None, time, error message or None) tuples
+    """
+    t = time.time()
+    cache = kwargs.get("cache")
+    if cache:
+        cache = kwargs["cache"] = DiskCache("make_geomTurbo") if cache is True else cache
+        hits, misses = cache.hits, cache.misses
+    job = partial(_make_geomTurbo_job, **kwargs)
+
+    if jobs == 1:
+        results = list(map(job, config_files))
+    else:
+        with ProcessPoolExecutor(jobs) as pool:
+            results = list(pool.map(job, config_files))
+
+    # the worker processes count the hits and misses of their own copy of the cache
+    counts = [result[-1] for result in results]
+    results = [result[:-1] for result in results]
+
+    print(f"\n\tGenerated {sum(r[3] is None for r in results)}/{len(results)} geomTurbo files:")
+    for config_file, _, my_time, error in results:
+        status = "done  " if error is None else "FAILED"
+        print(f"\t\t{status} {my_time:10.5f} s    {config_file}")
+        if error is not None:
+            print(f"\t\t\t{error}")
+    if cache:
+        cache.hits = hits + sum(count[0] for count in counts)
+        cache.misses = misses + sum(count[1] for count in counts)
+        stats = cache.stats()
+        print(
+            f"\n\tCache: {stats['hits']} hits, {stats['misses']} misses, "
+            f"{stats['entries']} entries, {stats['size'] / 1e6:.1f} MB in {cache.directory}"
+        )
     print(
         "This was generated in %(my_time).5f seconds\n" % {"my_time": time.time() - t}
     )
 
+    return results
+
+
+def _make_geomTurbo_job(config_file, cache=False, **kwargs):
+    """
+    Runs `make_geomTurbo`, returning its result as in `make_geomTurbos` followed by the
+    numbers of cache hits and misses of this call.
+    """
+    t = time.time()
+    counts = (cache.hits, cache.misses) if cache else (0, 0)
+    try:
+        output_file = make_geomTurbo(config_file, cache=cache, **kwargs)
+    except Exception as exc:
+        output_file, error = None, f"{type(exc).__name__}: {exc}"
+    else:
+        error = None
+    if cache:
+        counts = (cache.hits - counts[0], cache.misses - counts[1])
+    return config_file, output_file, time.time() - t, error, counts
+
+
+@lru_cache(maxsize=None)
+def _generator_digest():
+    """Hash of the source of parageom.reader, so that the cached files of make_geomTurbo
+    are not reused once the way they are generated changes."""
+    return file_digest(sys.modules[Param_3D.__module__].__file__)
+
 
 def show_section(*geomTurbo_files, span_percentage=0, _3Dimensional=False, LE_fillet=False, TE_fillet=False):
 
@@ -87,27 +220,30 @@ def show_section(*geomTurbo_files, span_percentage=0, _3Dimensional=False, LE_fi
             geomTurbo = GeomTurbo(
                 f"tmp_geomturbo/{file.split('/')[-1].replace('.cfg', '.geomTurbo')}",
                 "sectioned",
+                lazy=True,
             )
         else:
-            geomTurbo = GeomTurbo(file, "sectioned")
+            geomTurbo = GeomTurbo(file, "sectioned", lazy=True)
 
-        rotor = Rotor(geomTurbo)
-        le_points = geomTurbo.rotor_points[0, :, 0]
-        section = _le_section_getter(le_points, span_percentage)
+        # only the leading edge points and the two sections around the span are parsed,
+        # the plotted section is interpolated between them at the exact span percentage
+        le_points = geomTurbo.rotor_points[0][:, 0]
+        j, k, w = span_weights(span_coordinate(le_points), span_percentage * 0.01)
+        suction, pressure = [
+            (1 - w) * geomTurbo.section(side, j) + w * geomTurbo.section(side, k)
+            for side in (1, 0)
+        ]
 
-        points = np.vstack(
-            (
-                rotor.suction_sections[section],
-                np.flip(rotor.pressure_sections[section], axis=0),
-            )
-        )
+        points = np.vstack((suction, np.flip(pressure, axis=0)))
 
         ax.plot3D(points.T[0], points.T[2], points.T[1], colors[i])
         print(f"\t\tplotted {file} in {colors[i]}")
 
         if i == 0:
             le = points[0]
-            te = rotor.suction_sections[section, -1]
+            te = suction[-1]
+
+        geomTurbo.close()
 
     ax.set_xlim(le[0] - le[1] / 2, te[0] + le[1] / 2)
     ax.set_zlim(le[1] - 0.3, te[1] + 0.3)
@@ -123,19 +259,11 @@ def show_section(*geomTurbo_files, span_percentage=0, _3Dimensional=False, LE_fi
     plt.show()
 
 
-def _le_section_getter(le_points, span_percentage):
-    target = (le_points[-1] - le_points[0]) * (span_percentage * 0.01) + le_points[0]
-    prev = np.linalg.norm(le_points[0] - target)
-    i = 1
-    while prev > np.linalg.norm(le_points[i] - target):
-        prev = np.linalg.norm(le_points[i] - target)
-        i += 1
-        if i == le_points.shape[0]:
-            break
-    return i - 1
-
-
-def prepare_mesh_cfg(trb_file, *cfg, output_dir="to_run", row_number=1):
+def prepare_mesh_cfg(trb_file, *cfg, output_dir="to_run", row_number=1, jobs=1):
+    """
+    The geomTurbo files of the .cfg files are generated in a pool of `jobs` processes, see
+    `make_geomTurbos`. Those that fail are left out of RUN.ME.
+    """
 
     DIR = os.getcwd()
 
@@ -147,13 +275,20 @@ def prepare_mesh_cfg(trb_file, *cfg, output_dir="to_run", row_number=1):
     with open(f"{output_dir}/RUN.ME", "w") as f:
         f.write("module load fine/17.1\n")
 
+    results = make_geomTurbos(
+        [config_file for config_file in cfg if not config_file.endswith(".geomTurbo")],
+        jobs=jobs,
+        output_folder=output_dir,
+        N_sections=100,
+        N_points=100,
+    )
+    failed = [config_file for config_file, _, _, error in results if error is not None]
+
     for config_file in cfg:
         if config_file.endswith(".geomTurbo"):
             sh.copy(config_file, f"{output_dir}/{config_file.split('/')[-1]}")
-        else:
-            make_geomTurbo(
-                config_file, output_folder=output_dir, N_sections=100, N_points=100
-            )
+        elif config_file in failed:
+            continue
         mesh_output_dir = f"{output_dir}/{config_file.split('/')[-1].split('.')[0]}"
         make_output_folder(mesh_output_dir)
         options = {
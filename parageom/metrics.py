@@ -0,0 +1,146 @@
+import numpy as np
+
+from parageom.common import interp_rows
+
+
+# fields of the array returned by `section_metrics`, lengths in the units of the points
+# and angles in degrees
+metrics_dtype = np.dtype(
+    [
+        ("span", "f8"),
+        ("chord", "f8"),
+        ("stagger", "f8"),
+        ("max_thickness", "f8"),
+        ("max_thickness_location", "f8"),
+        ("max_camber", "f8"),
+        ("max_camber_location", "f8"),
+        ("le_radius", "f8"),
+        ("te_radius", "f8"),
+        ("inlet_metal_angle", "f8"),
+        ("outlet_metal_angle", "f8"),
+    ]
+)
+
+
+def section_metrics(rotor, plane=(0, 1), N_chord=201, edge_zone=0.005):
+    """
+    Computes the geometric metrics of every section of a rotor at once.
+
+    The sections are projected on the `plane` axes, axial then tangential (x and y with
+    the default coordinate order, see `Case.xyz`). Both sides are resampled on `N_chord`
+    stations along the chord, from which the thickness and the camber line are taken. The
+    leading and trailing edge radii are those of the least-squares circles through the
+    points of both sides within `edge_zone` chords of the edge, and the metal angles are
+    those of the camber line between 2.5% and 7.5% of the chord from each edge.
+
+    Parameters
+    ----------
+    rotor : Rotor or ndarray
+        `Rotor`, or rotor points of shape (2, N_sections, N_points, N_dim) with both sides
+        going from the leading to the trailing edge.
+
+    Returns:
+        structured array of shape (N_sections,) and dtype `metrics_dtype`, locations and
+        camber being relative to the chord, max_camber signed towards the pressure side
+    """
+    if hasattr(rotor, "pressure_sections"):
+        pressure, suction = rotor.pressure_sections, rotor.suction_sections
+    else:
+        pressure, suction = rotor
+    pressure = np.asarray(pressure, dtype="float")
+    suction = np.asarray(suction, dtype="float")
+
+    le, te = leading_edge(pressure, suction), trailing_edge(pressure, suction)
+    chord_vector = (te - le)[:, plane]
+    chord = np.linalg.norm(chord_vector, axis=1)
+    c_hat = chord_vector / chord[:, np.newaxis]
+    n_hat = np.stack((-c_hat[:, 1], c_hat[:, 0]), axis=1)
+
+    def _frame(points):
+        relative = points[..., plane] - le[:, np.newaxis, plane]
+        return (
+            np.einsum("ijk,ik->ij", relative, c_hat) / chord[:, np.newaxis],
+            np.einsum("ijk,ik->ij", relative, n_hat) / chord[:, np.newaxis],
+        )
+
+    (s_p, n_p), (s_s, n_s) = _frame(pressure), _frame(suction)
+
+    def _resample(s, n, stations):
+        stations = np.broadcast_to(stations, (chord.size, np.size(stations)))
+        return interp_rows(stations, np.maximum.accumulate(s, axis=1), n)
+
+    stations = np.linspace(0, 1, N_chord)
+    side_s, side_p = _resample(s_s, n_s, stations), _resample(s_p, n_p, stations)
+    thickness = np.abs(side_s - side_p)
+    camber = 0.5 * (side_s + side_p)
+
+    rows = np.arange(chord.size)
+    i_thickness = np.argmax(thickness, axis=1)
+    i_camber = np.argmax(np.abs(camber), axis=1)
+
+    def _metal_angle(a, b):
+        ends = 0.5 * (_resample(s_s, n_s, [a, b]) + _resample(s_p, n_p, [a, b]))
+        direction = (b - a) * c_hat + (ends[:, 1] - ends[:, 0])[:, np.newaxis] * n_hat
+        return np.degrees(np.arctan2(direction[:, 1], direction[:, 0]))
+
+    s_both, n_both = np.hstack((s_p, s_s)), np.hstack((n_p, n_s))
+
+    metrics = np.empty(chord.size, dtype=metrics_dtype)
+    metrics["span"] = span_coordinate(le)
+    metrics["chord"] = chord
+    metrics["stagger"] = np.degrees(np.arctan2(c_hat[:, 1], c_hat[:, 0]))
+    metrics["max_thickness"] = thickness[rows, i_thickness] * chord
+    metrics["max_thickness_location"] = stations[i_thickness]
+    metrics["max_camber"] = camber[rows, i_camber]
+    metrics["max_camber_location"] = stations[i_camber]
+    metrics["le_radius"] = _edge_radius(s_both, n_both, 0, edge_zone) * chord
+    metrics["te_radius"] = _edge_radius(s_both, n_both, 1, edge_zone) * chord
+    metrics["inlet_metal_angle"] = _metal_angle(0.025, 0.075)
+    metrics["outlet_metal_angle"] = _metal_angle(0.925, 0.975)
+
+    return metrics
+
+
+def leading_edge(pressure, suction):
+    """Leading edge point of every section, midpoint of the first points of both sides."""
+    return 0.5 * (np.asarray(pressure)[:, 0] + np.asarray(suction)[:, 0])
+
+
+def trailing_edge(pressure, suction):
+    """Trailing edge point of every section, midpoint of the last points of both sides."""
+    return 0.5 * (np.asarray(pressure)[:, -1] + np.asarray(suction)[:, -1])
+
+
+def span_coordinate(le_points):
+    """
+    Normalized arc length along the leading edge points of the sections, of shape
+    (N_sections, N_dim), from 0 at the first section to 1 at the last one. All zeros
+    if the leading edge has no length, eg. for a single section.
+    """
+    span = np.concatenate(
+        ([0], np.cumsum(np.linalg.norm(np.diff(le_points, axis=0), axis=1)))
+    )
+    return span / span[-1] if span[-1] > 0 else span
+
+
+# Functions used in section_metrics.
+
+
+def _edge_radius(s, n, edge, edge_zone):
+    """
+    Radius of the circle fitted, in the least-squares sense of Kasa, to the points of
+    every section closer than `edge_zone` to the edge at s = `edge`, NaN if there are
+    fewer than 3 of them.
+    """
+    weights = (np.abs(s - edge) < edge_zone).astype("float")
+    A = np.stack((2 * s, 2 * n, np.ones(s.shape)), axis=-1)
+    b = s**2 + n**2
+
+    AtA = np.einsum("ij,ijk,ijl->ikl", weights, A, A)
+    Atb = np.einsum("ij,ijk,ij->ik", weights, A, b)
+
+    valid = weights.sum(axis=1) >= 3
+    AtA[~valid] = np.eye(3)
+    a, c, d = np.linalg.solve(AtA, Atb[..., np.newaxis])[..., 0].T
+    radius = np.sqrt(np.maximum(d + a**2 + c**2, 0))
+    return np.where(valid, radius, np.nan)
@@ -1,11 +1,64 @@
+import json
+import mmap
+import os
+import re
+import shutil as sh
+import tempfile
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
 from warnings import warn
+
 import numpy as np
 import parablade as pb
-from geomdl import BSpline
+
+from parageom.cache import (
+    DiskCache,
+    file_key,
+    file_signature,
+    is_current,
+    save_arrays,
+    load_arrays,
+)
+from parageom.common import interp_rows
 
 
 class GeomTurbo:
-    def __init__(self, file, scale_factor=1, init="sectioned", xyz="xyz"):
+
+    # attributes stored in the cache, see `GeomTurbo._cached_read`. self.edges is stored
+    # as the flat list of its curves, see `_group_edges`
+    cached_attributes = [
+        "rotor_points",
+        "n_blades",
+        "sides",
+        "rotor_edges",
+        "stator_edges",
+        "curves",
+        "surfaces",
+    ]
+
+    def __init__(
+        self,
+        file,
+        scale_factor=1,
+        init="sectioned",
+        xyz="xyz",
+        lazy=False,
+        cache=False,
+    ):
+        """
+        Reads a .geomTurbo file.
+
+        `init` is either "sectioned" or "unsectioned". With `lazy=True`, a sectioned file
+        is only indexed and its sections parsed on demand (see `index_sectioned_turbo`).
+        `cache` can be True, to go through the default `DiskCache` stored in
+        ~/.cache/parageom/geomTurbo, or a `DiskCache` instance: the parsed arrays are then
+        kept in a .npz sidecar and later reads of the same unmodified file skip parsing
+        altogether. The cache is not used in lazy mode.
+        """
 
         self.file_path = file
         self.filename = file.split("/")[-1][:-10]
@@ -16,74 +69,140 @@ class GeomTurbo:
         self.surfaces = None
         self.curves = None
         self.rotor_edges = None
+        self.stator_edges = None
+        self.edges = None
         self.n_blades = None
+        self.read_time = None
+        self.read_throughput = None
+        self.sides = None
 
-        if init == "unsectioned":
+        self._buffer = None
+        self._close_buffer = None
+        self._blocks = None
+        self._sections = {}
+
+        if init not in ["sectioned", "unsectioned"]:
+            raise NotImplementedError()
+
+        if init == "sectioned" and lazy:
+            self.index_sectioned_turbo(self.file_path)
+        elif cache:
+            self._cached_read(init, DiskCache("geomTurbo") if cache is True else cache)
+        elif init == "unsectioned":
             self.read_unsectioned_turbo(self.file_path)
-        elif init == "sectioned":
+        else:
             self.read_sectioned_turbo(self.file_path)
+
+    def _cached_read(self, init, cache):
+        """
+        Sets the `GeomTurbo.cached_attributes` from the cache entry of the file, parsing
+        the file and adding the entry only if it is not found or if the file changed.
+        The entry is made of the .npz of the arrays and of a .json of the file signature,
+        see `is_current`.
+        """
+        key = file_key(self.file_path, init, self.xyz, _CACHE_VERSION)
+
+        path, signature_path = cache.get(key, ".npz"), cache.get(key, ".json")
+        if path is not None and signature_path is not None:
+            with open(signature_path, "r") as f:
+                signature = json.load(f)
+            current = is_current(self.file_path, signature)
+            if current is not None:
+                if current != signature:
+                    cache.put(key, partial(_dump_json, current), ".json")
+                attributes = load_arrays(path)
+                if "edge_curves" in attributes:
+                    self.edges = _group_edges(attributes.pop("edge_curves"))
+                for name, value in attributes.items():
+                    setattr(self, name, value)
+                return
+
+        signature = file_signature(self.file_path)
+
+        if init == "unsectioned":
+            self.read_unsectioned_turbo(self.file_path)
         else:
-            raise NotImplementedError()
+            self.read_sectioned_turbo(self.file_path)
+
+        attributes = {name: getattr(self, name, None) for name in self.cached_attributes}
+        if self.edges is not None:
+            attributes["edge_curves"] = [curve for row in self.edges for curve in row]
+        cache.put(key, lambda tmp: save_arrays(tmp, **attributes), ".npz")
+        cache.put(key, partial(_dump_json, signature), ".json")
 
     def read_unsectioned_turbo(self, file_path=None):
 
         """
-        This functions reads a sectioned geomTurbo file and returns a numpy array.
+        This functions reads an unsectioned geomTurbo file, ie. with the blades defined by
+        SISLS surfaces in the IGG part of the file.
 
-        self.surfaces is a list of 4 np.arrays corresponding to the pressure and suction
-        sides of the rotor and the stator.
+        self.surfaces is a list of np.arrays, one per SISLS surface of the file, the first
+        two being the pressure and suction sides of the rotor (then the stator, etc...).
         For the np.arrays:  axis 0:     the various horizontal sections
                             axis 1:     the cloud of points of the section
                                         (only for one side)
                             axis 2:     each point coordinate
 
+        self.edges is the list of the (leading edge, trailing edge) curves of each row,
+        self.rotor_edges and self.stator_edges being the first two.
+
+        Nothing depends on line numbers: the file is split into keyword lines and blocks
+        of numeric lines with the same number of columns (see `_numeric_blocks`). The
+        geometry part ends at the `NI_END GEOMTURBO` line, after which every 3 column block
+        is a curve unless it directly follows a `SISLS` keyword, in which case it is a
+        surface with the shape declared on the line preceding the keyword.
+
         """
 
         file = self.file_path if file_path == None else file_path
 
-        with open(file, "r") as f:
-            data = [
-                " ".join(line.rstrip("\n").replace("\t", " ").split())
-                for line in f.readlines()
-            ]
-
-        geom = [data[i].split(" ") for i in range(896)]
-        igg = data[897:]
-
-        self.rotor_edges = np.array([geom[99:280], geom[283:464]], dtype="float32")
-        self.stator_edges = np.array([geom[535:704], geom[707:876]], dtype="float32")
-        # TODO trouver un meilleur moyen de chopper les bons indexes
-
-        surfaces_shapes = []
-        for i, line in enumerate(igg):
-            igg[i] = line.split(" ")
-            if igg[i][0].startswith("SISLS"):
-                surfaces_shapes.append(list(map(int, igg[i - 1][2:4])))
-
-        curves, i, tmp_curve, adding = [], 0, [], False
-
-        while i < len(igg):
-            try:
-                igg[i] = list(map(float, igg[i]))
-                if len(igg[i]) == 3:
-                    if not adding:
-                        adding = True
-                    tmp_curve.append(igg[i])
-                else:
-                    if adding:
-                        curves.append(np.array(tmp_curve))
-                        tmp_curve = []
-                        adding = False
-            except:
-                pass
-            i += 1
-
-        curves = list(filter(lambda x: len(x) != 1, curves))
-        surfaces, curves = curves[-4:], curves[:-4]
-
-        for i, surface in enumerate(surfaces):
-            surfaces[i] = np.array(np.vsplit(surface, surfaces_shapes[i][1]))
-            surfaces[i] = surfaces[i].transpose((1, 0, 2))
+        with open(file, "rb") as f:
+            buf = f.read()
+
+        lines, blocks = _numeric_blocks(buf)
+        keywords = {
+            i: buf[lines[0][i] : lines[1][i]].split()
+            for i in np.flatnonzero(~lines[3] & (lines[2] > 0))
+        }
+
+        igg_start = next(
+            (
+                i
+                for i, keyword in keywords.items()
+                if [k.upper() for k in keyword[:2]] in [[b"NI_END", b"GEOMTURBO"]]
+            ),
+            None,
+        )
+        if igg_start is None:
+            warn(f"No `NI_END GEOMTURBO` line in {file}, edges will not be read.")
+            igg_start = -1
+
+        xyz_blocks = [block for block in blocks if block[4] == 3 and block[1] > 1]
+
+        edges = [_parse_block(buf, block) for block in xyz_blocks if block[0] < igg_start]
+        self.edges = _group_edges(edges)
+        self.rotor_edges = self.edges[0] if len(self.edges) > 0 else None
+        self.stator_edges = self.edges[1] if len(self.edges) > 1 else None
+
+        # the line before each SISLS keyword holds the orders and shape of the surface
+        surfaces_shapes = {
+            i: list(map(int, buf[lines[0][i - 1] : lines[1][i - 1]].split()[2:4]))
+            for i, keyword in keywords.items()
+            if i > igg_start and keyword[0].startswith(b"SISLS")
+        }
+
+        keyword_lines = np.array(sorted(keywords))
+        curves, surfaces = [], []
+        for block in xyz_blocks:
+            if block[0] < igg_start:
+                continue
+            previous = keyword_lines[np.searchsorted(keyword_lines, block[0]) - 1]
+            if previous in surfaces_shapes:
+                shape = surfaces_shapes.pop(previous)
+                surface = _parse_block(buf, block).reshape((shape[1], -1, 3))
+                surfaces.append(surface.transpose((1, 0, 2)))
+            else:
+                curves.append(_parse_block(buf, block))
 
         self.curves = curves
         self.surfaces = surfaces
@@ -103,44 +222,300 @@ class GeomTurbo:
         axis 2:     the cloud of points of the section
         axis 3:     the coordinates of the points
 
+        The file is tokenized in a single pass (see `_index_sectioned`) and each side is
+        converted in bulk. If both sides do not have the same number of points,
+        self.rotor_points is a list of two arrays instead, like for unsectioned files.
+
         """
-        # TODO make it auto to get the number of sections and the number of points
         file = self.file_path if file_path == None else file_path
 
-        with open(file, "r") as f:
-            raw_content = f.readlines()
+        t = time.perf_counter()
 
-        N_sections = int("".join(raw_content).split("\n")[7])
-        N_points = int("".join(raw_content).split("\n")[10])
-        self.n_blades = int("".join(raw_content).split("\n")[1].split(" ")[-1])
+        with open(file, "rb") as f:
+            buf = f.read()
 
-        content = "".join(raw_content).replace(
-            f"pressure\nSECTIONAL\n{N_sections}\n", ""
-        )
+        self.n_blades, sides = _index_sectioned(buf)
+        self.sides = [name for name, _ in sides]
+        points = [_parse_blocks(buf, blocks) for _, blocks in sides]
 
-        content = content.split(f"suction\nSECTIONAL\n{N_sections}\n")[1]
-        content = content.split(f"XYZ\n{N_points}\n")
-        for i, contour in enumerate(content):
-            content[i] = contour.split("\n")
-        content = content[1:]
+        if len(points) != 2:
+            raise ValueError(
+                f"{file} should define a suction and a pressure side, "
+                f"found {len(points)} side(s)."
+            )
+
+        if points[0].shape == points[1].shape:
+            self.rotor_points = np.empty((2, *points[0].shape))
+            self.rotor_points[0] = points[0]
+            self.rotor_points[1] = points[1]
+        else:
+            self.rotor_points = points
 
-        for i in range(len(content)):
-            if i != len(content) - 1:
-                content[i] = content[i][:-2]
+        if self.xyz != "xyz":
+            xyz = _xyz_order(self.xyz)
+            if isinstance(self.rotor_points, list):
+                self.rotor_points = [side[..., xyz] for side in self.rotor_points]
             else:
-                content[i] = content[i][:-1]
-            for j in range(len(content[i])):
-                content[i][j] = content[i][j].split(" ")
+                self.rotor_points = self.rotor_points[..., xyz]
 
-        self.rotor_points = np.array(content, dtype="float").reshape(
-            (2, N_sections, N_points, 3)
-        )
+        self.read_time = time.perf_counter() - t
+        self.read_throughput = len(buf) / self.read_time / 1e6
+
+    def index_sectioned_turbo(self, file_path=None):
+
+        """
+        Lazy counterpart of `read_sectioned_turbo`.
+
+        The file is memory-mapped and scanned once to record the byte offsets of every
+        section. A section is only parsed the first time it is accessed, either through
+        `GeomTurbo.section` or by indexing self.rotor_points, which is then a
+        `_LazyRotorPoints` proxy with the same axes as the array of the eager reader. As
+        with the eager reader, if both sides do not have the same number of points,
+        self.rotor_points is a list of two proxies, one per side, instead.
+
+        The memory map is released by `GeomTurbo.close`, at the end of a `with` block or
+        once the object is garbage collected.
+
+        """
+        file = self.file_path if file_path == None else file_path
+
+        t = time.perf_counter()
+
+        with open(file, "rb") as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._close_buffer = weakref.finalize(self, self._buffer.close)
+
+        self.n_blades, sides = _index_sectioned(self._buffer)
+        if len(sides) != 2:
+            raise ValueError(
+                f"{file} should define a suction and a pressure side, "
+                f"found {len(sides)} side(s)."
+            )
+
+        self.sides = [name for name, _ in sides]
+        self._blocks = [blocks for _, blocks in sides]
+        self._sections = {}
+        if len({blocks[0][2] for blocks in self._blocks}) == 1:
+            self.rotor_points = _LazyRotorPoints(self)
+        else:
+            self.rotor_points = [_LazyRotorPoints(self, side) for side in range(2)]
+
+        self.read_time = time.perf_counter() - t
+        self.read_throughput = len(self._buffer) / self.read_time / 1e6
+
+    def section(self, side, section_idx):
+        """
+        Returns the points of a single section, of shape (N_points, 3).
 
+        `side` is either the index of the side along axis 0 of self.rotor_points or its
+        name ("suction" or "pressure"). When the file was opened with `lazy=True`, only
+        this section is parsed, and it is cached for the following calls.
+        """
+        if isinstance(side, str):
+            side = self.sides.index(side)
+
+        if self._blocks is None:
+            return self.rotor_points[side][section_idx]
+
+        section_idx = range(len(self._blocks[side]))[section_idx]
+        if (side, section_idx) not in self._sections:
+            points = _parse_blocks(self._buffer, [self._blocks[side][section_idx]])[0]
+            if self.xyz != "xyz":
+                points = points[:, _xyz_order(self.xyz)]
+            self._sections[(side, section_idx)] = points
+
+        return self._sections[(side, section_idx)]
+
+    def _first_point(self, side, section_idx):
+        """Parses only the first line of a section, ie. its leading edge point."""
+        if (side, section_idx) in self._sections:
+            return self._sections[(side, section_idx)][0]
+
+        start, end, _ = self._blocks[side][section_idx]
+        newline = self._buffer.find(b"\n", start, end)
+        end = end if newline == -1 else newline
+        point = np.fromstring(self._buffer[start:end], sep=" ")
         if self.xyz != "xyz":
-            xyz = self.xyz.replace("x", "0").replace("y", "1").replace("z", "2")
-            self.rotor_points = self.rotor_points[
-                ..., [int(xyz[0]), int(xyz[1]), int(xyz[2])]
+            point = point[_xyz_order(self.xyz)]
+        return point
+
+    def close(self):
+        """Releases the memory map of a lazily read file."""
+        if self._buffer is not None:
+            self._close_buffer()
+            self._buffer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @staticmethod
+    def load_many(paths, workers=None, xyz="xyz"):
+        """
+        Reads several sectioned .geomTurbo files in a pool of `workers` processes
+        (default: one per cpu, `workers=1` reads them in this process).
+
+        Returns a `GeomTurboBatch`. If all the files share the same number of sections
+        and points, they are stacked in one shared memory array of shape
+        (N_files, 2, N_sections, N_points, 3), otherwise each file is returned separately.
+
+        Every file is read once: the workers parse it into a shared memory segment of its
+        own, which is then copied into the stacked array and released. No segment is left
+        behind if a file fails to be read, the first error being raised once all the files
+        were processed.
+        """
+        paths = list(paths)
+        workers = os.cpu_count() if workers is None else workers
+
+        results, errors = [], []
+        if workers == 1:
+            for path in paths:
+                try:
+                    results.append(_read_shared(path, xyz))
+                except Exception as exc:
+                    errors.append(exc)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for future in [pool.submit(_read_shared, path, xyz) for path in paths]:
+                    try:
+                        results.append(future.result())
+                    except Exception as exc:
+                        errors.append(exc)
+
+        names = [name for _, _, name in results if name is not None]
+        shm = None
+        try:
+            if errors:
+                raise errors[0]
+
+            n_blades = [n for n, _, _ in results]
+            shapes = {shape for _, shape, name in results if name is not None}
+
+            if len(names) == len(paths) and len(shapes) == 1:
+                shape = (len(paths), *shapes.pop())
+                shm = SharedMemory(create=True, size=max(1, int(np.prod(shape)) * 8))
+                rotor_points = np.ndarray(shape, buffer=shm.buf)
+                for i, name in enumerate(names):
+                    rotor_points[i] = _take_shared(name, shape[1:])
+            else:
+                rotor_points = [
+                    points if name is None else _take_shared(name, points)
+                    for _, points, name in results
+                ]
+        except BaseException:
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+            raise
+        finally:
+            # segments not taken yet because of an error
+            for name in names:
+                try:
+                    _take_shared(name, (0,))
+                except FileNotFoundError:
+                    pass
+
+        return GeomTurboBatch(paths, rotor_points, n_blades, shm)
+
+
+class GeomTurboBatch:
+    """
+    Geometries of several .geomTurbo files read with `GeomTurbo.load_many`.
+
+    attributes:
+
+        rotor_points:   ndarray of shape (N_files, 2, N_sections, N_points, 3) when all the
+                        files share the same resolution, living in shared memory that is
+                        released by `GeomTurboBatch.close`. Otherwise the list of the
+                        rotor_points of every file.
+        n_blades:       list with the number of blades of every file
+        paths:          list of the paths of the files, in the same order
+    """
+
+    def __init__(self, paths, rotor_points, n_blades, shared_memory=None):
+        self.paths = paths
+        self.rotor_points = rotor_points
+        self.n_blades = n_blades
+        self.shared_memory = shared_memory
+
+    @property
+    def stacked(self):
+        return self.shared_memory is not None
+
+    def close(self):
+        """Frees the shared memory, self.rotor_points must not be used afterwards."""
+        if self.shared_memory is not None:
+            self.rotor_points = None
+            self.shared_memory.close()
+            self.shared_memory.unlink()
+            self.shared_memory = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class _LazyRotorPoints:
+    """
+    Read-only stand-in for the rotor_points array of a `GeomTurbo` opened with
+    `lazy=True`. Indexing it only parses the sections that are needed, and
+    np.asarray(...) materializes the whole (2, N_sections, N_points, 3) array.
+
+    With `side` set, it stands for the (N_sections, N_points, 3) array of that side
+    only, as used when the sides do not have the same number of points.
+    """
+
+    def __init__(self, geomTurbo, side=None):
+        self._geomTurbo = geomTurbo
+        self._side = side
+        self.ndim = 4 if side is None else 3
+
+    @property
+    def shape(self):
+        blocks = self._geomTurbo._blocks
+        if self._side is not None:
+            return (len(blocks[self._side]), blocks[self._side][0][2], 3)
+        return (len(blocks), len(blocks[0]), blocks[0][0][2], 3)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __array__(self, dtype=None, copy=None):
+        return np.asarray(self[:, :], dtype=dtype)
+
+    def __getitem__(self, key):
+        key = key if isinstance(key, tuple) else (key,)
+        if any(k is Ellipsis or k is None for k in key):
+            return np.asarray(self)[key]
+        if self._side is not None:
+            key = (self._side,) + key
+
+        key = key + (slice(None),) * (2 - len(key))
+        sides = np.arange(len(self._geomTurbo._blocks))[key[0]]
+        sections = np.arange(len(self._geomTurbo._blocks[0]))[key[1]]
+        rest = key[2:]
+
+        # leading edge points only need the first line of each section
+        if len(rest) > 0 and isinstance(rest[0], (int, np.integer)) and rest[0] == 0:
+            get, rest = self._geomTurbo._first_point, rest[1:]
+        else:
+            get = self._geomTurbo.section
+
+        points = np.array(
+            [
+                [get(side, section) for section in np.atleast_1d(sections)]
+                for side in np.atleast_1d(sides)
             ]
+        )
+        points = points[
+            0 if np.ndim(sides) == 0 else slice(None),
+            0 if np.ndim(sections) == 0 else slice(None),
+        ]
+        return points[(slice(None),) * (np.ndim(sides) + np.ndim(sections)) + rest]
 
 
 class From_param_2D:
@@ -176,9 +551,37 @@ class From_param_2D:
 
 
 class Param_3D:
-    def __init__(self, file, N_sections=181, N_points=362, UV=None):
+    def __init__(
+        self,
+        file,
+        N_sections=181,
+        N_points=362,
+        UV=None,
+        evaluate=True,
+        batch=False,
+        chunk_size=None,
+        tolerance=None,
+        N_dense=None,
+        blade=None,
+    ):
 
         """
+        `file` is the parablade cfg of the blade. An already built `pb.Blade3D` can be
+        given as `blade` instead, `file` is then ignored (see `BladeEvaluator`).
+
+        With `evaluate=False` the sections are not evaluated here, which is meant for
+        `Param_3D.stream_geomTurbo`. Otherwise they are evaluated with one call per
+        section, or all at once with `Param_3D.evaluate_sections` if `batch=True`. The
+        latter gives parablade paired (u, v) arrays: the first, middle and last sections
+        are checked against one call per section, and if they differ the evaluation
+        falls back to one call per section with a warning. See bin/BenchmarkParam3D.py
+        to time both.
+
+        By default the chordwise points follow the same geometric distribution for every
+        section. If a chordal deviation `tolerance` is given, they are placed section by
+        section from the curvature instead (see `Param_3D.adaptive_distribution`), and
+        N_points becomes the number of points needed to meet it.
+
         attributes:
 
             blade_coordinates: ndarray of shape (N_sections, N_points, N_dim)
@@ -190,89 +593,286 @@ class Param_3D:
             with the suction and pressure side respectively on axis 0.
         """
 
-        self.blade = pb.Blade3D(file, UV=UV)
-        self.blade.make_blade()
+        if blade is None:
+            blade = pb.Blade3D(file, UV=UV)
+            blade.make_blade()
+        self.blade = blade
+
+        self.batch = batch
 
-        tmp1 = np.geomspace(1e-2, 0.5, N_points//4)-1e-2
-        tmp2 = np.flip(np.ones(tmp1.shape)-tmp1)
-        u = np.hstack((tmp1, tmp2))*0.5
-        u = np.hstack((u, np.flip(np.ones(u.shape)-u)))
-        # u4 = np.linspace(0, 1, N_points)
         V = np.linspace(0, 1, N_sections)
+        if tolerance is None:
+            u = _geometric_distribution(N_points)
+        else:
+            N_dense = 4 * N_points if N_dense is None else N_dense
+            u = self.adaptive_distribution(V, tolerance, N_dense, chunk_size)
+            N_points = u.shape[1]
 
         self.N_blades = self.blade.IN["N_BLADES"]
 
         self.N_sections = N_sections
         self.N_points = N_points
-        self.blade_coordinates = np.array(
-            list(map(lambda v: self.blade.get_section_coordinates(u, v).T, V))
-        )
-        # ^ this does this:
-        # self.section_coordinates = []
-        # for i in v:
-        #     self.section_coordinates.append(blade.get_section_coordinates(u, i).T)
-        # self.section_coordinates = np.array(self.section_coordinates)
+        self.u = u
+        self.V = V
+        self.blade_coordinates = None
+        if evaluate:
+            self.blade_coordinates = self._evaluate(u, V, chunk_size)
 
         self.split_coordinates = None
 
+    def adaptive_distribution(
+        self, V, tolerance, N_dense=1448, chunk_size=None, max_iterations=5
+    ):
+        """
+        Places the chordwise points of every section from its curvature, so that the
+        chordal deviation between the polyline and the section stays under `tolerance`,
+        relative to the length of the side, for every side of every section.
+
+        The sections are first evaluated on a dense geometric distribution of `N_dense`
+        points. Along each side, an arc of curvature k is within tolerance d with
+        segments of length sqrt(8 d / k), so the points are spread with a density of
+        sqrt(k / 8 d) per unit length, with a floor of one point every 5% of the side so
+        that flat regions are not left empty. Both sides share the same chordwise
+        distribution, following the larger of their two densities, so that the points of
+        the suction and pressure sides stay paired for the fillets, with the trailing
+        edge at u = 0.5.
+        All the sections then get the largest number of points needed by any of them, as
+        required by the geomTurbo format.
+
+        The deviation is then measured at the middle of every segment, and the number of
+        points raised until it is met, at most `max_iterations` times.
+
+        Returns:
+            ndarray of shape (len(V), N_points), the u values of every section
+        """
+        u_dense = _geometric_distribution(N_dense)
+        points = self._evaluate(u_dense, V, chunk_size)
+
+        # both sides from the leading to the trailing edge, along c = u on the suction
+        # side and c = 1 - u on the pressure side
+        half = u_dense.size // 2
+        c = u_dense[:half]
+        counts = []
+        for side in (points[:, :half], points[:, half:][:, ::-1]):
+            segments = np.diff(side, axis=1)
+            ds = np.maximum(np.linalg.norm(segments, axis=2), np.finfo(float).tiny)
+            length = np.sum(ds, axis=1, keepdims=True)
+
+            # curvature from the turning angle at every interior point
+            cos = np.sum(segments[:, 1:] * segments[:, :-1], axis=2) / (
+                ds[:, 1:] * ds[:, :-1]
+            )
+            curvature = np.arccos(np.clip(cos, -1, 1)) / (
+                0.5 * (ds[:, 1:] + ds[:, :-1])
+            )
+            curvature = np.pad(curvature, ((0, 0), (1, 1)), mode="edge")
+
+            density = np.sqrt(curvature / (8 * tolerance * length)) + 20 / length
+            counts.append(0.5 * (density[:, 1:] + density[:, :-1]) * ds)
+
+        density = np.pad(np.cumsum(np.maximum(*counts), axis=1), ((0, 0), (1, 0)))
+        N_half = int(np.ceil(np.max(density[:, -1]))) + 1
+
+        for _ in range(max_iterations):
+            targets = np.linspace(0, 1, N_half) * density[:, -1:]
+            c_half = interp_rows(targets, density, c)
+            u = np.hstack((c_half, 1 - c_half[:, ::-1]))
+
+            deviation = self._chordal_deviation(u, V, chunk_size)
+            if deviation <= tolerance:
+                break
+            # the deviation goes as the square of the length of the segments
+            refinement = 1.05 * np.sqrt(deviation / tolerance)
+            N_half = int(np.ceil((N_half - 1) * refinement)) + 1
+        else:
+            warn(
+                f"Chordal deviation of {deviation:.3e} above the tolerance of "
+                f"{tolerance:.3e} after {max_iterations} iterations."
+            )
+
+        return u
+
+    def _chordal_deviation(self, u, V, chunk_size=None):
+        """
+        Largest distance between the middle of the arcs of the sections between the u
+        values and their chord, relative to the length of the side.
+        """
+        half = u.shape[1] // 2
+        u_middle = 0.5 * (u[:, 1:] + u[:, :-1])
+        u_middle = np.delete(u_middle, half - 1, axis=1)  # across the trailing edge
+        points = self._evaluate(u, V, chunk_size)
+        middles = self._evaluate(u_middle, V, chunk_size)
+
+        deviation = 0.0
+        for side, middle in (
+            (points[:, :half], middles[:, : half - 1]),
+            (points[:, half:], middles[:, half - 1 :]),
+        ):
+            chords = np.diff(side, axis=1)
+            lengths = np.maximum(np.linalg.norm(chords, axis=2), np.finfo(float).tiny)
+            distances = np.linalg.norm(
+                np.cross(chords, middle - side[:, :-1]), axis=2
+            ) / lengths
+            side_length = np.sum(lengths, axis=1, keepdims=True)
+            deviation = max(deviation, np.max(distances / side_length))
+
+        return deviation
+
+    def _evaluate(self, u, V, chunk_size=None):
+        """Evaluates the sections with `Param_3D.evaluate_sections` if `self.batch`,
+        otherwise or if its result is not that of parablade section by section, with one
+        call per section."""
+        U = np.broadcast_to(u, (np.size(V), np.shape(u)[-1]))
+        if self.batch:
+            coordinates = self.evaluate_sections(u, V, chunk_size)
+            if _matches_per_section(self.blade, U, V, coordinates):
+                return coordinates
+            self.batch = False
+        return _evaluate_per_section(self.blade, U, V)
+
+    def evaluate_sections(self, u, V, chunk_size=None):
+        """
+        Evaluates the blade on a whole (u, v) grid. Rather than one call per span
+        station, the grid is flattened into (u, v) pairs so that parablade evaluates the
+        spanwise design variable distributions and the sections in a single vectorized
+        call, or one call per `chunk_size` sections to bound memory use.
+
+        u can be shared by all the sections, of shape (N_points,), or given for each of
+        them with shape (len(V), N_points).
+
+        Returns:
+            ndarray of shape (len(V), N_points, 3)
+        """
+        V = np.asarray(V, dtype="float")
+        U = np.broadcast_to(u, (V.size, np.shape(u)[-1]))
+        chunk_size = V.size if chunk_size is None else chunk_size
+
+        coordinates = np.empty((*U.shape, 3))
+        for i in range(0, V.size, chunk_size):
+            u_chunk = U[i : i + chunk_size]
+            v_chunk = np.repeat(V[i : i + chunk_size], U.shape[1])
+            coordinates[i : i + chunk_size] = (
+                self.blade.get_section_coordinates(u_chunk.ravel(), v_chunk)
+                .T.reshape((-1, U.shape[1], 3))
+            )
+
+        return coordinates
+
     def output_geomTurbo(
         self,
         filename="output.geomTurbo",
         LE_fillet=False,
         TE_fillet=True,
         xyz="xyz",
+        precision=None,
     ):
         """This function outputs a geomTurbo file of the blade ready to be read and used
         in autogrid.
 
 
         N_sections: scalar, number of sections.
-        N_points: scalar, best if even, odd number of points not yet tested"""
+        N_points: scalar, best if even, odd number of points not yet tested
+        precision: number of significant digits of the coordinates, None to write them
+        exactly"""
 
-        shape = self.blade_coordinates.shape
-        if shape[1] % 2 == 0:
-            tmp = self.blade_coordinates
-            tmp = tmp.reshape((shape[0], 2, shape[1] // 2, 3))
-            tmp[:, 0, -1] = tmp[:, 1, 0]  # matching the trailing edge
-        else:
-            warn(
-                "Odd number of points not yet tested. If problems occur, it might be due to this."
-            )
-            middle = int(shape[1] / 2 - 0.5)
-            tmp = np.insert(
-                self.blade_coordinates,
-                middle,
-                self.blade_coordinates[:, middle, :],
-                axis=1,
-            )
-            tmp = tmp.reshape((shape[0], 2, tmp.shape[1] // 2, 3))
-        tmp[:, 1] = np.flip(tmp[:, 1], axis=1)
-        tmp[..., [0, 1, 2]] = tmp[..., [1, 2, 0]]
+        self.split_coordinates = _split_sections(self.blade_coordinates)
+        self.split_coordinates = self._fillet_sections(
+            self.split_coordinates, LE_fillet, TE_fillet
+        )
+
+        self.write_geomTurbo(filename, xyz=xyz, precision=precision)
+
+    def stream_geomTurbo(
+        self,
+        filename="output.geomTurbo",
+        LE_fillet=False,
+        TE_fillet=True,
+        xyz="xyz",
+        precision=None,
+    ):
+        """Same as `Param_3D.output_geomTurbo`, except that each section is evaluated,
+        filleted and written before the next one is computed, so that memory use only
+        depends on N_points. As the pressure side comes after the whole suction side in
+        the file, its blocks are spooled to a temporary file and appended at the end.
+
+        self.blade_coordinates and self.split_coordinates are left untouched, the
+        object can be created with `evaluate=False`."""
+
+        xyz = _xyz_order(xyz)
+        N_points = self.N_points
+        camberline_lengths = {}
+
+        with open(filename, "w") as f, tempfile.TemporaryFile(
+            "w+", dir=os.path.dirname(os.path.abspath(filename))
+        ) as pressure:
+            f.write(_geomTurbo_header(self.N_blades))
+            f.write(f"suction\nSECTIONAL\n{self.N_sections}\n")
+
+            for i, v in enumerate(self.V):
+                # the fillets add their points to self.N_points for each call
+                self.N_points = N_points
+                u = self.u[i] if np.ndim(self.u) == 2 else self.u
+                section = self.blade.get_section_coordinates(u, v).T
+                section = _split_sections(section[np.newaxis])
+                section = self._fillet_sections(
+                    section, LE_fillet, TE_fillet, camberline_lengths
+                )
+                f.write(_format_sections(section[:, 0][..., xyz], precision, i + 1))
+                pressure.write(
+                    _format_sections(section[:, 1][..., xyz], precision, i + 1)
+                )
+
+            f.write(f"pressure\nSECTIONAL\n{self.N_sections}\n")
+            pressure.seek(0)
+            sh.copyfileobj(pressure, f)
+
+    def _fillet_sections(
+        self, point_cloud, LE_fillet, TE_fillet, camberline_lengths=None
+    ):
+        """
+        Applies the leading and trailing edge fillets to split coordinates.
 
-        self.split_coordinates = tmp
+        The cutoffs are relative to the camberline length of the first section of
+        `point_cloud`, unless it is already in the `camberline_lengths` dictionary, which
+        is filled otherwise. This way a blade filleted one section at a time gets the
+        same geometry as when it is filleted as a whole.
+        """
+        camberline_lengths = {} if camberline_lengths is None else camberline_lengths
 
         if LE_fillet:
-            self.split_coordinates = self._LE_fillet(
-                self.split_coordinates,
+            camberline_lengths.setdefault("LE", _camberline_length(point_cloud[0]))
+            point_cloud = self._LE_fillet(
+                point_cloud,
                 cutoff_percentage=self.blade.IN["LE_FILLET_cutoff_percentage"],
                 min_angle=self.blade.IN["LE_FILLET_min_angle"],
+                camberline_length=camberline_lengths["LE"],
             )
         if TE_fillet:
-            self.split_coordinates = self._TE_fillet(
-                self.split_coordinates,
+            camberline_lengths.setdefault("TE", _camberline_length(point_cloud[0]))
+            point_cloud = self._TE_fillet(
+                point_cloud,
                 cutoff_percentage=self.blade.IN["TE_FILLET_cutoff_percentage"],
                 min_angle=self.blade.IN["TE_FILLET_min_angle"],
+                camberline_length=camberline_lengths["TE"],
             )
 
-        self.write_geomTurbo(filename, xyz=xyz)
+        return point_cloud
 
-    def _LE_fillet(self, point_cloud, N_le=30, cutoff_percentage=0.08, min_angle=15):
+    def _LE_fillet(
+        self,
+        point_cloud,
+        N_le=30,
+        cutoff_percentage=0.08,
+        min_angle=15,
+        camberline_length=None,
+    ):
         """
         Sub-function that rounds the leading edge based on a couple parameters.
         The defaults seem to work quite well.
 
         N_le is the number of newly generated points at the leading edge.
-        min_width is the width of the blade under which the blade will be cut.
+        cutoff_percentage is the distance to the leading edge, relative to the camberline
+        length, at which the blade is cut.
 
         With p1 the point along the section surface at which the blade is to be cut, the angle alpha
         corresponds to the angle between the tangent to the surface at p1 and the line between
@@ -282,83 +882,59 @@ class Param_3D:
         and increase the angle.
         min_angle should be input in degrees.
 
+        All the sections are processed at once, the new points being quadratic Bezier arcs
+        evaluated in closed form by `_fillet_arcs`.
+
         """
         # NOTE there is a slight problem with the number of points.
         # the array is expanded by N_le-1 points actually...
         min_angle = np.deg2rad(min_angle)
         tmp = point_cloud
-        final_array = np.zeros((tmp.shape[0], 2, tmp.shape[2] + N_le - 1, 3))
-        
-        # get approx length of camberline of first section
-        i, camberline_length = 1, 0
-        while tmp.shape[2] > i:
-            camberline_length += _dist(_centre(*tmp[0, :, i]), _centre(*tmp[0, :, (i-1)]))
-            i += 1
-
-        for k, section in enumerate(tmp):
-            le = section[0, 0]
-
-            i = 1
-            while _dist(le, _centre(*section[:, i]))/camberline_length < cutoff_percentage:
-                i += 1
-                elem = section[:, i]
-
-            suction_curve = BSpline.Curve()
-            pressure_curve = BSpline.Curve()
-            suction_curve.degree = 2
-            pressure_curve.degree = 2
-
-            le = section[0, 0]
-            tangent_vectors = section[:, i] - section[:, i + 1]
-            normal_vector = section[0, i] - section[1, i]
-            ce = section[1, i] + 1 / 2 * normal_vector
-
-            if np.min(_angle(tangent_vectors, le - section[:, i])) < min_angle:
-                j = 1
-                while (
-                    np.min(
-                        _angle(tangent_vectors, _centre(*section[:, j]) - section[:, i])
-                    )
-                    < min_angle
-                ):
-                    j += 1
-                le = _centre(*section[:, j])
-
-            suction_ctrl = _get_intersect(
-                le, section[0, i], tangent_vectors[0], le - ce
-            )
-            pressure_ctrl = _get_intersect(
-                le, section[1, i], tangent_vectors[1], le - ce
-            )
+        sections = np.arange(tmp.shape[0])
 
-            suction_curve.ctrlpts = [list(elem[0]), suction_ctrl, list(le)]
-            pressure_curve.ctrlpts = [list(elem[1]), pressure_ctrl, list(le)]
+        if camberline_length is None:
+            camberline_length = _camberline_length(tmp[0])
 
-            suction_curve.knotvector = [0, 0, 0, 2, 2, 2]
-            pressure_curve.knotvector = [0, 0, 0, 2, 2, 2]
+        centres = _centre(tmp[:, 0], tmp[:, 1])
+        le = tmp[:, 0, 0]
 
-            suction_curve.delta = 1 / (N_le + i)
-            pressure_curve.delta = 1 / (N_le + i)
+        # first point of the camberline far enough from the leading edge
+        distances = np.linalg.norm(centres - le[:, np.newaxis], axis=2)
+        i = _first(distances / camberline_length >= cutoff_percentage, start=1)
 
-            new_head = np.array(
-                [
-                    np.flip(suction_curve.evalpts, axis=0),
-                    np.flip(pressure_curve.evalpts, axis=0),
-                ]
-            )
+        cut = tmp[sections, :, i]
+        tangent_vectors = cut - tmp[sections, :, i + 1]
+        ce = _centre(cut[:, 1], cut[:, 0])
+
+        le = _move_edge(le, centres, cut, tangent_vectors, min_angle, start=1)
 
-            final_array[k, :] = np.concatenate((new_head, tmp[k, :, i + 1 :]), axis=1)
+        # the arcs of N_le + i points replace the first i + 1 points of each side
+        m = np.arange(tmp.shape[2] + N_le - 1)
+        N_arc = N_le + i[:, np.newaxis]
+        t = np.clip(1 - m / (N_arc - 1), 0, 1)
+        new_head = _fillet_arcs(cut, le, le - ce, tangent_vectors, t)
+        rest = tmp[:, :, np.clip(m - N_le + 1, 0, tmp.shape[2] - 1)]
+
+        final_array = np.where((m < N_arc)[:, np.newaxis, :, np.newaxis], new_head, rest)
 
         self.N_points += 2 * (N_le - 1)
         return final_array
 
-    def _TE_fillet(self, point_cloud, N_te=30, cutoff_percentage=0.05, min_angle=6):
+    def _TE_fillet(
+        self,
+        point_cloud,
+        N_te=30,
+        cutoff_percentage=0.05,
+        min_angle=6,
+        camberline_length=None,
+    ):
         """
         Sub-function that rounds the trailing edge based on a couple parameters.
         The defaults seem to work quite well.
 
         N_te is the number of newly generated points at the trailing edge.
-        min_width is the width of the blade under which the blade will be cut.
+        cutoff_percentage is the distance to the trailing edge, relative to the camberline
+        length, at which the blade is cut.
 
         With p1 the point along the section surface at which the blade is to be cut, the angle alpha
         corresponds to the angle between the tangent to the surface at p1 and the line between
@@ -368,120 +944,371 @@ class Param_3D:
         and reduce the angle.
         min_angle should be input in degrees.
 
+        All the sections are processed at once, see `Param_3D._LE_fillet`.
+
         """
 
         min_angle = np.deg2rad(min_angle)
         tmp = point_cloud
-        final_array = np.zeros((tmp.shape[0], 2, tmp.shape[2] + N_te, 3))
-
-        # get approx length of camberline of first section
-        i, camberline_length = 1, 0
-        while tmp.shape[2] > i:
-            camberline_length += _dist(_centre(*tmp[0, :, i]), _centre(*tmp[0, :, (i-1)]))
-            i += 1
-
-        for k, section in enumerate(tmp):
-            te = section[0, -1]
-
-            i = 1
-            while _dist(te, _centre(*section[:, -i]))/camberline_length < cutoff_percentage:
-                i += 1
-                elem = section[:, -i]
-
-            suction_curve = BSpline.Curve()
-            pressure_curve = BSpline.Curve()
-            suction_curve.degree = 2
-            pressure_curve.degree = 2
-
-            tangent_vectors = section[:, -i] - section[:, -i - 1]
-            normal_vector = section[0, -i] - section[1, -i]
-            ce = section[1, -i] + 1 / 2 * normal_vector
-
-            if np.min(_angle(tangent_vectors, te - section[:, -i])) < min_angle:
-                j = 1
-                while (
-                    np.min(
-                        _angle(
-                            tangent_vectors, _centre(*section[:, -j]) - section[:, -i]
-                        )
-                    )
-                    < min_angle
-                ):
-                    j += 1
-                te = _centre(*section[:, -j])
-
-            suction_ctrl = _get_intersect(
-                te, section[0, -i], tangent_vectors[0], te - ce
-            )
-            pressure_ctrl = _get_intersect(
-                te, section[1, -i], tangent_vectors[1], te - ce
-            )
+        sections = np.arange(tmp.shape[0])
+        N = tmp.shape[2]
+
+        if camberline_length is None:
+            camberline_length = _camberline_length(tmp[0])
 
-            suction_curve.ctrlpts = [list(elem[0]), suction_ctrl, list(te)]
-            pressure_curve.ctrlpts = [list(elem[1]), pressure_ctrl, list(te)]
+        # camberline from the trailing edge
+        centres = _centre(tmp[:, 0], tmp[:, 1])[:, ::-1]
+        te = tmp[:, 0, -1]
 
-            suction_curve.knotvector = [0, 0, 0, 2, 2, 2]
-            pressure_curve.knotvector = [0, 0, 0, 2, 2, 2]
+        distances = np.linalg.norm(centres - te[:, np.newaxis], axis=2)
+        i = _first(distances / camberline_length >= cutoff_percentage) + 1
 
-            suction_curve.delta = 1 / (N_te + i)
-            pressure_curve.delta = 1 / (N_te + i)
+        cut = tmp[sections, :, N - i]
+        tangent_vectors = cut - tmp[sections, :, N - i - 1]
+        ce = _centre(cut[:, 1], cut[:, 0])
 
-            new_tail = np.array([suction_curve.evalpts, pressure_curve.evalpts])
+        te = _move_edge(te, centres, cut, tangent_vectors, min_angle)
 
-            final_array[k, :] = np.concatenate((tmp[k, :, :-i], new_tail), axis=1)
+        # the arcs of N_te + i points replace the last i points of each side
+        m = np.arange(N + N_te)
+        start = N - i[:, np.newaxis]
+        t = np.clip((m - start) / (N_te + i[:, np.newaxis] - 1), 0, 1)
+        new_tail = _fillet_arcs(cut, te, te - ce, tangent_vectors, t)
+        rest = tmp[:, :, np.minimum(m, N - 1)]
+
+        final_array = np.where((m >= start)[:, np.newaxis, :, np.newaxis], new_tail, rest)
 
         self.N_points += 2 * N_te
         return final_array
 
-    def write_geomTurbo(self, filename="output.geomTurbo", xyz="xyz"):
+    def write_geomTurbo(self, filename="output.geomTurbo", xyz="xyz", precision=None):
+        """
+        Writes self.split_coordinates to a sectioned .geomTurbo file.
+
+        The coordinates are written with `precision` significant digits, or with the
+        shortest representation that reads back exactly if `precision` is None.
+        Each side is formatted at once by `_format_sections` and written straight to the file.
+        """
+
+        xyz = _xyz_order(xyz)
+
+        with open(filename, "w") as f:
+            f.write(_geomTurbo_header(self.N_blades))
+            for k, side in enumerate(["suction", "pressure"]):
+                f.write(f"{side}\nSECTIONAL\n{self.split_coordinates.shape[0]}\n")
+                f.write(
+                    _format_sections(self.split_coordinates[:, k][..., xyz], precision)
+                )
+
+
+class BladeEvaluator:
+    """
+    Builds a blade once and serves any number of outputs from it, at different
+    resolutions, fillets or coordinate orders, without parsing the cfg or calling
+    `make_blade` again.
+
+    Parameters
+    ----------
+    file : string or dict
+        Parablade cfg of the blade, as accepted by `pb.Blade3D`.
+    UV : optional
+        Passed on to `pb.Blade3D`.
+    batch : bool, optional
+        Evaluates the sections from paired (u, v) arrays, see `Param_3D` and
+        `BladeEvaluator.evaluate`. Default: False
+
+    Example
+    -------
+    >>> evaluator = BladeEvaluator(IN)
+    >>> evaluator.output_many(
+    ...     [
+    ...         dict(filename="coarse.geomTurbo", N_sections=51, N_points=102),
+    ...         dict(filename="fine.geomTurbo", N_sections=181, N_points=362),
+    ...     ]
+    ... )
+    """
 
-        xyz = xyz.replace("x", "0").replace("y", "1").replace("z", "2")
-        xyz = [int(xyz[0]), int(xyz[1]), int(xyz[2])]
+    def __init__(self, file, UV=None, batch=False):
+
+        self.blade = pb.Blade3D(file, UV=UV)
+        self.blade.make_blade()
+        self.batch = batch
+
+    def param_3D(self, N_sections=181, N_points=362, **kwargs):
+        """Returns a `Param_3D` of the blade, see `Param_3D` for the arguments."""
+        kwargs.setdefault("batch", self.batch)
+        return Param_3D(None, N_sections, N_points, blade=self.blade, **kwargs)
+
+    def evaluate(self, resolutions, chunk_size=None):
+        """
+        Evaluates the blade for several (N_sections, N_points) resolutions. With
+        `self.batch`, the (u, v) pairs of all of them are gathered in a single parablade
+        call, or one call per `chunk_size` pairs, and checked as in `Param_3D`. Otherwise
+        each section is evaluated with a call of its own.
+
+        Returns:
+            list of `Param_3D` with their blade_coordinates set
+        """
+        params = [self.param_3D(*resolution, evaluate=False) for resolution in resolutions]
+        if not params:
+            return params
+        if not self.batch:
+            for p in params:
+                p.blade_coordinates = p._evaluate(p.u, p.V)
+            return params
+
+        U = [np.broadcast_to(p.u, (p.V.size, np.shape(p.u)[-1])) for p in params]
+        u = np.concatenate([u_grid.ravel() for u_grid in U])
+        v = np.concatenate([np.repeat(p.V, u_grid.shape[1]) for p, u_grid in zip(params, U)])
+        chunk_size = u.size if chunk_size is None else chunk_size
+
+        coordinates = np.empty((u.size, 3))
+        for i in range(0, u.size, chunk_size):
+            coordinates[i : i + chunk_size] = self.blade.get_section_coordinates(
+                u[i : i + chunk_size], v[i : i + chunk_size]
+            ).T
+
+        ends = np.cumsum([u_grid.size for u_grid in U])[:-1]
+        for p, u_grid, points in zip(params, U, np.split(coordinates, ends)):
+            p.blade_coordinates = points.reshape((*u_grid.shape, 3))
+
+        if not all(
+            _matches_per_section(self.blade, u_grid, p.V, p.blade_coordinates)
+            for p, u_grid in zip(params, U)
+        ):
+            self.batch = False
+            return self.evaluate(resolutions, chunk_size)
+
+        return params
+
+    def output_geomTurbo(
+        self,
+        filename="output.geomTurbo",
+        N_sections=181,
+        N_points=362,
+        LE_fillet=False,
+        TE_fillet=True,
+        xyz="xyz",
+        precision=None,
+        tolerance=None,
+        stream=False,
+    ):
+        """Writes one geomTurbo file, see `Param_3D.output_geomTurbo`."""
+        param = self.param_3D(
+            N_sections, N_points, evaluate=not stream, tolerance=tolerance
+        )
+        output = param.stream_geomTurbo if stream else param.output_geomTurbo
+        output(filename, LE_fillet, TE_fillet, xyz=xyz, precision=precision)
+        return param
 
-        lines = [
-            "GEOMETRY TURBO VERSION 5",
-            f"number_of_blades {int(self.N_blades[0])}",
-            "blade_expansion_factor_hub  0.01",
-            "blade_expansion_factor_shroud 0.01",
-            "blade_tangential_definition	  0",
+    def output_many(self, requests):
+        """
+        Writes several geomTurbo files. `requests` is a list of dictionaries of
+        `BladeEvaluator.output_geomTurbo` arguments. The resolutions without tolerance
+        are evaluated together by `BladeEvaluator.evaluate`, the others one after
+        another.
+
+        Returns:
+            list of the written file names
+        """
+        batched = [
+            request
+            for request in requests
+            if request.get("tolerance") is None and not request.get("stream")
         ]
+        params = self.evaluate(
+            [
+                (request.get("N_sections", 181), request.get("N_points", 362))
+                for request in batched
+            ]
+        )
 
-        for k, side in enumerate(["suction", "pressure"]):
-            lines.append(side)
-            lines.append("SECTIONAL")
-            lines.append(str(self.split_coordinates.shape[0]))
+        for request, param in zip(batched, params):
+            param.output_geomTurbo(
+                request.get("filename", "output.geomTurbo"),
+                request.get("LE_fillet", False),
+                request.get("TE_fillet", True),
+                xyz=request.get("xyz", "xyz"),
+                precision=request.get("precision"),
+            )
+        for request in requests:
+            if request.get("tolerance") is not None or request.get("stream"):
+                self.output_geomTurbo(**request)
 
-            for i, section in enumerate(self.split_coordinates[:, k]):
-                lines.append(f"# section {i+1}")
-                lines.append("XYZ")
-                lines.append(str(self.split_coordinates.shape[2]))
+        return [request.get("filename", "output.geomTurbo") for request in requests]
 
-                for point in np.asarray(
-                    np.asarray(section, dtype="float"), dtype="str"
-                ):
-                    lines.append(" ".join(point[xyz]))
 
-        with open(filename, "w") as f:
-            f.write("\n".join(lines))
-            f.write("\n")  # don't remove it
+# Functions used in write_geomTurbo.
+
+
+def _geomTurbo_header(N_blades):
+    lines = [
+        "GEOMETRY TURBO VERSION 5",
+        f"number_of_blades {int(N_blades[0])}",
+        "blade_expansion_factor_hub  0.01",
+        "blade_expansion_factor_shroud 0.01",
+        "blade_tangential_definition	  0",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _format_sections(sections, precision=None, start=1):
+    """
+    Formats the XYZ blocks of sections of shape (N_sections, N_points, 3), numbered from
+    `start`, with a single string formatting operation over all the coordinates.
+    """
+    N_sections, N_points, _ = sections.shape
+    line = " ".join(["%r" if precision is None else f"%.{precision}g"] * 3) + "\n"
+    template = "".join(
+        f"# section {i}\nXYZ\n{N_points}\n" + line * N_points
+        for i in range(start, start + N_sections)
+    )
+    return template % tuple(np.asarray(sections, dtype="float").ravel().tolist())
+
+
+# Functions used in Param_3D.__init__ and adaptive_distribution.
+
+
+def _evaluate_per_section(blade, U, V):
+    """Sections of shape (len(V), N_points, 3), with one parablade call per section."""
+    return np.array(list(map(lambda u, v: blade.get_section_coordinates(u, v).T, U, V)))
+
+
+def _matches_per_section(blade, U, V, coordinates):
+    """
+    Checks the sections `coordinates` evaluated from paired (u, v) arrays against one
+    parablade call per section for the first, middle and last sections, warning if they
+    differ.
+    """
+    sections = np.unique([0, len(V) // 2, len(V) - 1])
+    reference = _evaluate_per_section(blade, U[sections], np.asarray(V)[sections])
+    atol = 1e-9 * np.max(np.abs(reference))
+    if np.allclose(coordinates[sections], reference, rtol=1e-9, atol=atol):
+        return True
+    warn(
+        "The batched evaluation of the sections differs from the one section by "
+        "section, falling back to the latter."
+    )
+    return False
+
+
+def _geometric_distribution(N_points):
+    """Chordwise u values refined geometrically towards the leading and trailing edges."""
+    tmp1 = np.geomspace(1e-2, 0.5, N_points // 4) - 1e-2
+    tmp2 = np.flip(np.ones(tmp1.shape) - tmp1)
+    u = np.hstack((tmp1, tmp2)) * 0.5
+    return np.hstack((u, np.flip(np.ones(u.shape) - u)))
+
+
+# Functions used in output_geomTurbo and stream_geomTurbo.
+
+
+def _split_sections(blade_coordinates):
+    """
+    Splits sections of shape (N_sections, N_points, 3) into the two sides, with shape
+    (N_sections, 2, N_points / 2, 3), both going from the leading to the trailing edge,
+    and reorders the coordinates. Note that for an even N_points, the input is modified.
+    """
+    shape = blade_coordinates.shape
+    if shape[1] % 2 == 0:
+        tmp = blade_coordinates
+        tmp = tmp.reshape((shape[0], 2, shape[1] // 2, 3))
+        tmp[:, 0, -1] = tmp[:, 1, 0]  # matching the trailing edge
+    else:
+        warn(
+            "Odd number of points not yet tested. If problems occur, it might be due to this."
+        )
+        middle = int(shape[1] / 2 - 0.5)
+        tmp = np.insert(
+            blade_coordinates,
+            middle,
+            blade_coordinates[:, middle, :],
+            axis=1,
+        )
+        tmp = tmp.reshape((shape[0], 2, tmp.shape[1] // 2, 3))
+    tmp[:, 1] = np.flip(tmp[:, 1], axis=1)
+    tmp[..., [0, 1, 2]] = tmp[..., [1, 2, 0]]
+    return tmp
 
 
 # Functions used in _LE_fillet and _TE_fillet.
 
 
-def _dist(p1, p2):
-    return np.linalg.norm(p2 - p1)
+def _camberline_length(section):
+    """Approximate length of the camberline of a section of shape (2, N_points, 3)."""
+    centres = _centre(section[0], section[1])
+    return sum(np.linalg.norm(centres[1:] - centres[:-1], axis=1))
+
+
+def _first(mask, start=0):
+    """
+    Index along axis 1 of the first True value of `mask`, looking from `start`. Raises
+    an IndexError if a row has none, as the point looked for is then off the section.
+    """
+    mask = mask[:, start:]
+    missing = ~mask.any(axis=1)
+    if missing.any():
+        raise IndexError(
+            f"No point of sections {np.flatnonzero(missing).tolist()} meets the fillet "
+            "criterion, the section is too short or too coarse."
+        )
+    return start + np.argmax(mask, axis=1)
+
+
+def _move_edge(edge, centres, cut, tangent_vectors, min_angle, start=0):
+    """
+    For the sections where the line from the cut points to the edge is less than
+    `min_angle` away from the surface tangents, moves the edge in to the first point of
+    the camberline `centres` (ordered from the edge, looking from `start`) that is seen
+    from the cut points under at least `min_angle`.
+    """
+    sharp = np.min(_angle(tangent_vectors, edge[:, np.newaxis] - cut), axis=1) < min_angle
+
+    angles = _angle(
+        tangent_vectors[:, :, np.newaxis],
+        centres[:, np.newaxis] - cut[:, :, np.newaxis],
+    )
+    # only the sharp sections need such a point
+    j = _first(
+        (np.min(angles, axis=1) >= min_angle) | ~sharp[:, np.newaxis], start=start
+    )
+
+    return np.where(sharp[:, np.newaxis], centres[np.arange(len(j)), j], edge)
+
+
+def _fillet_arcs(cut, edge, normal, tangent_vectors, t):
+    """
+    Evaluates the quadratic Bezier arcs going from the cut points of each side, tangent
+    to the surface, to the edge, the middle control point being on the plane through
+    the edge of normal `normal`.
+
+    cut and tangent_vectors are of shape (N_sections, 2, 3), edge and normal of shape
+    (N_sections, 3) and t holds the parameters at which to evaluate each section, with
+    shape (N_sections, N_t).
+
+    Returns:
+        numpy.ndarray of shape (N_sections, 2, N_t, 3)
+    """
+    ctrl = _get_intersect(
+        edge[:, np.newaxis], cut, tangent_vectors, normal[:, np.newaxis]
+    )
+    t = t[:, np.newaxis, :, np.newaxis]
+    return (
+        (1 - t) ** 2 * cut[:, :, np.newaxis]
+        + 2 * t * (1 - t) * ctrl[:, :, np.newaxis]
+        + t**2 * edge[:, np.newaxis, np.newaxis]
+    )
 
 
 def _angle(v1, v2):
     """
-    Gets the angle between vector elements of two similar sized arrays.
+    Gets the angle between the vectors along the last axis of two broadcastable arrays.
     Returns:
-        numpy.ndarray of shape N_vectors
+        numpy.ndarray with the broadcast shape without the last axis
     """
     return np.arccos(
-        np.diag(np.tensordot(v1, v2, axes=[1, 1]))
-        / (np.linalg.norm(v1, axis=1) * np.linalg.norm(v2, axis=1))
+        np.sum(v1 * v2, axis=-1)
+        / (np.linalg.norm(v1, axis=-1) * np.linalg.norm(v2, axis=-1))
     )
 
 
@@ -490,7 +1317,198 @@ def _centre(p1, p2):
 
 
 def _get_intersect(p1, p2, v1, n):
-    n_hat = n / np.linalg.norm(n)
-    k = np.matmul(p1.T, n_hat)
-    t = (k - np.dot(p2, n_hat)) / np.dot(v1, n_hat)
-    return list(p2 + t * v1)
+    """
+    Intersection of the line through p2 of direction v1 with the plane through p1 of
+    normal n, vectors being along the last axis.
+    """
+    n_hat = n / np.linalg.norm(n, axis=-1, keepdims=True)
+    k = np.sum(p1 * n_hat, axis=-1, keepdims=True)
+    t = (k - np.sum(p2 * n_hat, axis=-1, keepdims=True)) / np.sum(
+        v1 * n_hat, axis=-1, keepdims=True
+    )
+    return p2 + t * v1
+
+
+# Functions used in GeomTurbo._cached_read.
+
+# changes whenever the cache entries of GeomTurbo are written differently
+_CACHE_VERSION = 2
+
+
+def _dump_json(data, file):
+    with open(file, "w") as f:
+        json.dump(data, f)
+
+
+def _group_edges(curves):
+    """
+    Groups the edge curves of an unsectioned file by pairs of (leading edge, trailing
+    edge) of each row, as an array of shape (2, N_points, 3) or a list of both curves if
+    they do not have the same number of points.
+    """
+    return [
+        np.array(curves[i : i + 2], dtype="float32")
+        if curves[i].shape == curves[i + 1].shape
+        else curves[i : i + 2]
+        for i in range(0, len(curves) - 1, 2)
+    ]
+
+
+# Functions used in read_sectioned_turbo and index_sectioned_turbo.
+
+
+def _xyz_order(xyz):
+    xyz = xyz.replace("x", "0").replace("y", "1").replace("z", "2")
+    return [int(xyz[0]), int(xyz[1]), int(xyz[2])]
+
+
+# anchored on the newline rather than on `^` so that the scan runs on memchr, the first
+# line of the file (the format version) is therefore never visited.
+_KEYWORD_LINE = re.compile(rb"\n[ \t]*([A-Za-z#][^\r\n]*)")
+_COUNT_LINE = re.compile(rb"\r?\n[ \t]*([^\r\n]*)\r?\n?")
+
+
+def _index_sectioned(buf):
+    """
+    Tokenizes the raw content of a sectioned geomTurbo file in one pass.
+
+    Only the keyword lines are visited, the coordinate blocks are skipped over by the
+    regular expression engine and only located by their byte offsets.
+
+    Returns:
+        n_blades:   number of blades read in the header, None if not found
+        sides:      list of (name, blocks) in the order of the file, with blocks the list
+                    of (start, end, N_points) byte spans of each section coordinates
+    """
+    n_blades, sides, block = None, [], None
+
+    for match in _KEYWORD_LINE.finditer(buf):
+        if block is not None:
+            sides[-1][1].append((block[0], match.start(), block[1]))
+            block = None
+
+        keyword = match.group(1).split()
+
+        if keyword[0] == b"number_of_blades":
+            n_blades = int(keyword[-1])
+        elif keyword[0].lower() in (b"suction", b"pressure"):
+            sides.append((keyword[0].lower().decode(), []))
+        elif keyword[0] == b"XYZ":
+            count = _COUNT_LINE.match(buf, match.end())
+            block = (count.end(), int(count.group(1)))
+
+    if block is not None:
+        sides[-1][1].append((block[0], len(buf), block[1]))
+
+    return n_blades, sides
+
+
+def _parse_blocks(buf, blocks):
+    """
+    Converts the coordinate blocks of one side into an array of shape
+    (N_sections, N_points, 3).
+    """
+    N_points = blocks[0][2]
+    if any(n != N_points for _, _, n in blocks):
+        raise ValueError("All the sections of a side must have the same number of points.")
+
+    points = np.fromstring(b" ".join(buf[a:b] for a, b, _ in blocks), sep=" ")
+    if points.size != len(blocks) * N_points * 3:
+        raise ValueError(
+            f"Expected {len(blocks) * N_points * 3} coordinates, read {points.size}."
+        )
+
+    return points.reshape((len(blocks), N_points, 3))
+
+
+# Functions used in GeomTurbo.load_many.
+
+
+def _read_shared(path, xyz):
+    """
+    Parses a file into a new shared memory segment, left for the caller to release with
+    `_take_shared`.
+
+    Returns:
+        (number of blades, shape of rotor_points, name of the segment), or
+        (number of blades, list of the arrays of both sides, None) for ragged files
+    """
+    geomTurbo = GeomTurbo(path, xyz=xyz)
+    points = geomTurbo.rotor_points
+    if isinstance(points, list):
+        return geomTurbo.n_blades, points, None
+
+    shm = SharedMemory(create=True, size=max(1, points.nbytes))
+    try:
+        np.ndarray(points.shape, buffer=shm.buf)[...] = points
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+    shm.close()
+
+    # the segment belongs to the caller now, the resource tracker would otherwise
+    # unlink it or warn about a leak when this worker exits
+    resource_tracker.unregister(shm._name, "shared_memory")
+    return geomTurbo.n_blades, points.shape, shm.name
+
+
+def _take_shared(name, shape):
+    """Copies a segment written by `_read_shared` into an array and releases it."""
+    shm = SharedMemory(name=name)
+    try:
+        return np.ndarray(shape, buffer=shm.buf).copy()
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+# Functions used in read_unsectioned_turbo.
+
+# lookup tables indexed by byte value
+_BLANK_CHARS = np.zeros(256, dtype=bool)
+_BLANK_CHARS[list(b" \t\r\n\v\f")] = True
+_NUMERIC_CHARS = np.zeros(256, dtype=bool)
+_NUMERIC_CHARS[list(b"0123456789+-.")] = True
+
+
+def _numeric_blocks(buf):
+    """
+    Splits the raw content of a file into lines and blocks of numeric lines, with numpy
+    operations on the bytes only.
+
+    Returns:
+        lines:  (starts, ends, N_tokens, is_numeric) arrays, one value per line, a line
+                being numeric if its first token starts with a digit, a sign or a dot
+        blocks: list of (first line, N_lines, start, end, N_columns) for every run of
+                consecutive numeric lines with the same number of tokens; start and end
+                being the byte span of the run
+    """
+    chars = np.frombuffer(buf, dtype=np.uint8)
+    newlines = np.flatnonzero(chars == ord("\n"))
+    starts = np.r_[0, newlines + 1]
+    ends = np.r_[newlines, chars.size]
+
+    blank = _BLANK_CHARS[chars]
+    token_starts = np.flatnonzero(~blank & np.r_[True, blank[:-1]])
+    first_tokens = np.searchsorted(token_starts, starts)
+    counts = np.searchsorted(token_starts, ends) - first_tokens
+
+    first_chars = chars[token_starts[np.minimum(first_tokens, token_starts.size - 1)]]
+    numeric = (counts > 0) & _NUMERIC_CHARS[first_chars]
+
+    columns = np.where(numeric, counts, 0)
+    run_starts = np.flatnonzero(np.r_[True, columns[1:] != columns[:-1]])
+    run_lengths = np.diff(np.r_[run_starts, columns.size])
+
+    blocks = [
+        (first, length, starts[first], ends[first + length - 1], columns[first])
+        for first, length in zip(run_starts, run_lengths)
+        if columns[first] > 0
+    ]
+    return (starts, ends, counts, numeric), blocks
+
+
+def _parse_block(buf, block):
+    _, N_lines, start, end, N_columns = block
+    return np.fromstring(buf[start:end], sep=" ").reshape((N_lines, N_columns))
@@ -1,13 +1,30 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
+from parageom.metrics import leading_edge, trailing_edge, span_coordinate, section_metrics
+
 
 class Rotor:
     """
     The Rotor class stores all the different point clouds and curves associated with the
     give rotor.
+
+    The points of both sides are kept in a single contiguous buffer, of which
+    `pressure_sections` and `suction_sections` are views, and `section_coordinates` is
+    only assembled the first time it is accessed. A Rotor is therefore cheap to keep
+    around and is meant to be shared, eg. by all the sections matched in a `Case`.
     """
 
+    __slots__ = (
+        "_points",
+        "_section_coordinates",
+        "_span",
+        "leading_edge",
+        "trailing_edge",
+        "N_sections",
+        "scale_factor",
+    )
+
     def __init__(self, Initializer_object):
 
         """Takes in a rotor_points list (outputted by both read functions), as well
@@ -33,31 +50,112 @@ class Rotor:
 
         """
 
-        self.pressure_sections = Initializer_object.rotor_points[0]
-        self.suction_sections = Initializer_object.rotor_points[1]
+        rotor_points = Initializer_object.rotor_points
+        if isinstance(rotor_points, list) and rotor_points[0].shape != rotor_points[1].shape:
+            # different number of points on both sides, one buffer per side
+            self._points = tuple(np.ascontiguousarray(side) for side in rotor_points)
+        else:
+            # no copy if it already is a contiguous array, as returned by GeomTurbo
+            self._points = np.ascontiguousarray(rotor_points)
 
-        # TODO read the LE and TE from the point coordinates
         if Initializer_object.rotor_edges is not None:
             self.leading_edge = Initializer_object.rotor_edges[0]
             self.trailing_edge = Initializer_object.rotor_edges[1]
         else:
-            self.leading_edge = None
-            self.trailing_edge = None
+            # sectioned files have no edge curves, they are read from the points
+            self.leading_edge = leading_edge(self.pressure_sections, self.suction_sections)
+            self.trailing_edge = trailing_edge(self.pressure_sections, self.suction_sections)
 
         self.N_sections = self.suction_sections.shape[0]
+        self._section_coordinates = getattr(Initializer_object, "section_coordinates", None)
+        self._span = None
+        self.scale_factor = Initializer_object.scale_factor
+
+    @property
+    def pressure_sections(self):
+        return self._points[0]
 
-        try:
-            self.section_coordinates = Initializer_object.section_coordinates
-        except:
-            # TODO find way to vectorize this...
-            self.section_coordinates = np.array(
-                [
-                    np.vstack((self.suction_sections[i], self.pressure_sections[i]))
-                    for i in range(self.N_sections)
-                ]
+    @property
+    def suction_sections(self):
+        return self._points[1]
+
+    @property
+    def section_coordinates(self):
+        """Suction then pressure side points of every section, built on first access."""
+        if self._section_coordinates is None:
+            self._section_coordinates = np.concatenate(
+                (self.suction_sections, self.pressure_sections), axis=1
             )
+        return self._section_coordinates
 
-        self.scale_factor = Initializer_object.scale_factor
+    @property
+    def span(self):
+        """Span coordinate of every section, see `span_coordinate`, computed once."""
+        if self._span is None:
+            self._span = span_coordinate(self.pressure_sections[:, 0])
+        return self._span
+
+    def at_span(self, fractions):
+        """
+        Interpolates whole sections at arbitrary span fractions, linearly between the two
+        sections around each of them, in one batched operation.
+
+        fractions: scalar or array of span fractions between 0 (hub) and 1 (shroud)
+
+        Returns:
+            ndarray of shape (*np.shape(fractions), N_points, N_dim), the suction then
+            pressure side points as in `section_coordinates`
+        """
+        i, j, w = span_weights(self.span, fractions)
+        w = w[..., np.newaxis, np.newaxis]
+        sections = self.section_coordinates
+        return (1 - w) * sections[i] + w * sections[j]
+
+    def metrics(self, **kwargs):
+        """Geometric metrics of every section, see `parageom.metrics.section_metrics`."""
+        return section_metrics(self, **kwargs)
+
+    def export(
+        self,
+        file,
+        sections=None,
+        dim="3D",
+        append=False,
+        precision=None,
+        npy_file=None,
+    ):
+
+        """
+        Writes the point cloud of any subset of sections to a txt file, one point per line
+        preceded by its index in the section, in a single formatting operation.
+
+        sections: index or list of indices of the sections, all of them if None
+        dim: "3D" writes x, y, z, "2D" writes z, x
+        append: appends to `file` instead of overwriting it
+        precision: number of significant digits, None to write the coordinates exactly
+        npy_file: if given, the points are also saved there as an ndarray of shape
+            (N_exported_sections, N_points, N_columns)
+        """
+
+        if dim not in ("2D", "3D"):
+            raise ValueError(f"`dim` should be '2D' or '3D', got {dim!r}.")
+
+        sections = range(self.N_sections) if sections is None else sections
+        points = self.section_coordinates[np.atleast_1d(sections)] * self.scale_factor
+        points = points[..., [2, 0]] if dim == "2D" else points
+
+        N_points = points.shape[1]
+        line = "\t".join(["%r" if precision is None else f"%.{precision}g"] * points.shape[2])
+        template = "".join(f"{i}\t{line}\n" for i in range(N_points))
+
+        # f-strings format numpy floats of any precision as python floats, so do these
+        with open(file, "a" if append else "w") as f:
+            f.write(
+                (template * points.shape[0])
+                % tuple(np.asarray(points, dtype="float").ravel().tolist())
+            )
+        if npy_file is not None:
+            np.save(npy_file, points)
 
     def parablade_section_export(self, section_idx, file=None, dim="2D", is_new=True):
 
@@ -65,8 +163,6 @@ class Rotor:
         Writes the point cloud of a section to a txt file
         """
 
-        section = self.section_coordinates[section_idx] * self.scale_factor
-
         if file is None:
             file = (
                 "./confidential/blade.txt"
@@ -74,22 +170,7 @@ class Rotor:
                 else "./confidential/3Dblade.txt"
             )
 
-        mode = "w" if is_new else "a"
-        with open(file, mode) as f:
-            if dim == "2D":
-                f.writelines(
-                    [
-                        f"{i}\t{section.T[2, i]}\t{section.T[0, i]}\n"
-                        for i in range(len(section.T[0]))
-                    ]
-                )
-            elif dim == "3D":
-                f.writelines(
-                    [
-                        f"{i}\t{section.T[0, i]}\t{section.T[1, i]}\t{section.T[2, i]}\n"
-                        for i in range(len(section.T[0]))
-                    ]
-                )
+        self.export(file, section_idx, dim=dim, append=not is_new)
 
         print(f"Done exporting to {file}")
 
@@ -105,10 +186,12 @@ class Rotor:
             else iterator
         )
 
-        self.parablade_section_export(iterator[0], file=file, dim="3D")
+        if file is None:
+            file = "./confidential/3Dblade.txt"
+
+        self.export(file, iterator, dim="3D")
 
-        for i in iterator[1:]:
-            self.parablade_section_export(i, file=file, dim="3D", is_new=False)
+        print(f"Done exporting to {file}")
 
     def plot_section(self, section_idx):
 
@@ -125,3 +208,21 @@ class Rotor:
         )
 
         plt.show()
+
+
+def span_weights(span, fractions):
+    """
+    Returns the indices i, j and weights w such that each of `fractions` lies at
+    (1 - w) * section i + w * section j, the fractions being clipped to [0, 1]. j is
+    i + 1, except for a single section where i = j = 0 and w = 0.
+    """
+    fractions = np.clip(np.asarray(fractions, dtype="float"), 0, 1)
+    i = np.clip(
+        np.searchsorted(span, fractions, side="right") - 1, 0, max(span.size - 2, 0)
+    )
+    j = np.minimum(i + 1, span.size - 1)
+    width = span[j] - span[i]
+    w = np.divide(
+        fractions - span[i], width, out=np.zeros(fractions.shape), where=width > 0
+    )
+    return i, j, w
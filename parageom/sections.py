@@ -0,0 +1,104 @@
+import numpy as np
+
+from parageom.metrics import span_coordinate
+
+
+strategies = ("uniform", "end-clustered", "curvature", "twist")
+
+
+def select_sections(
+    le_points, N_sections, strategy="uniform", te_points=None, weight=1.0, plane=(0, 1)
+):
+    """
+    Picks exactly `N_sections` distinct section indices, always including the first and the
+    last section, spaced along the leading edge according to `strategy`:
+
+        uniform :       evenly along the leading edge arc length.
+        end-clustered : along the leading edge arc length, with a cosine spacing that
+                        clusters the sections towards the hub and the shroud.
+        curvature :     evenly along a coordinate mixing the leading edge arc length and its
+                        turning angle, so that sections gather where the leading edge bends.
+        twist :         same as curvature with the change of stagger angle of the sections,
+                        measured in the `plane` axes from the leading to the trailing edge
+                        points `te_points`.
+
+    `weight` sets the share of the turning or stagger angle in the coordinate of the last two
+    strategies: 0 is the same as uniform and large values only follow the angle.
+
+    The coordinate of every section is computed once, and the indices are those of the
+    sections closest to the evenly spaced targets, found with `np.searchsorted`. Targets
+    falling on the same section are moved to the next free ones.
+
+    Parameters
+    ----------
+    le_points : ndarray of shape (N, N_dim)
+        Leading edge points of all the sections, eg. `GeomTurbo.rotor_points[0, :, 0]`.
+    te_points : ndarray of shape (N, N_dim), optional
+        Trailing edge points of all the sections, required by the twist strategy.
+
+    Returns:
+        ndarray of N_sections increasing indices
+    """
+    le_points = np.asarray(le_points, dtype="float")
+    N = le_points.shape[0]
+    if not 2 <= N_sections <= N:
+        raise ValueError(f"`N_sections` should be between 2 and {N}, got {N_sections}.")
+
+    s = span_coordinate(le_points)
+
+    if strategy in ("uniform", "end-clustered"):
+        coordinate = s
+    elif strategy == "curvature":
+        coordinate = _mixed_coordinate(s, _turning_angles(le_points), weight)
+    elif strategy == "twist":
+        if te_points is None:
+            raise ValueError("`te_points` are required by the twist strategy.")
+        chord = (np.asarray(te_points, dtype="float") - le_points)[:, plane]
+        stagger = np.unwrap(np.arctan2(chord[:, 1], chord[:, 0]))
+        coordinate = _mixed_coordinate(s, np.abs(np.diff(stagger)), weight)
+    else:
+        raise ValueError(f"`strategy` should be one of {strategies}, got {strategy!r}.")
+
+    targets = np.linspace(0, 1, N_sections)
+    if strategy == "end-clustered":
+        targets = 0.5 * (1 - np.cos(np.pi * targets))
+
+    # closest of the two sections around every target
+    right = np.clip(np.searchsorted(coordinate, targets), 1, N - 1)
+    left = right - 1
+    indices = np.where(
+        targets - coordinate[left] <= coordinate[right] - targets, left, right
+    )
+
+    # makes the indices strictly increasing, staying within the sections
+    steps = np.arange(N_sections)
+    indices = np.maximum.accumulate(indices - steps) + steps
+    return np.minimum(indices, N - N_sections + steps)
+
+
+# Functions used in select_sections.
+
+
+def _turning_angles(points):
+    """
+    Turning angle of the polyline through `points`, given for each of its segments as the
+    mean of the angles at both of its ends.
+    """
+    segments = np.diff(points, axis=0)
+    lengths = np.linalg.norm(segments, axis=1, keepdims=True)
+    segments = segments / np.where(lengths > 0, lengths, 1)
+    cosines = np.clip(np.einsum("ij,ij->i", segments[:-1], segments[1:]), -1, 1)
+    angles = np.pad(np.arccos(cosines), 1)
+    return 0.5 * (angles[:-1] + angles[1:])
+
+
+def _mixed_coordinate(s, angles, weight):
+    """
+    Normalized coordinate adding the normalized arc length `s` and `weight` times the
+    normalized cumulative `angles` of the segments between the sections.
+    """
+    total = np.sum(angles)
+    if total == 0:
+        return s
+    coordinate = s + weight * np.concatenate(([0], np.cumsum(angles))) / total
+    return coordinate / coordinate[-1]
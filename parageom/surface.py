@@ -0,0 +1,196 @@
+import numpy as np
+
+
+class BSplineSurface:
+    """
+    Tensor-product B-spline surface, evaluated in a batched way on whole (u, v) grids or
+    lists of (u, v) pairs, u running along the sections and v along the span.
+
+    Parameters
+    ----------
+    control_points : ndarray of shape (N_ctrl_v, N_ctrl_u, N_dim)
+    knots_u, knots_v : ndarray
+        Clamped knot vectors, of N_ctrl + degree + 1 values.
+    degree_u, degree_v : int
+    """
+
+    def __init__(self, control_points, knots_u, knots_v, degree_u=3, degree_v=3):
+
+        self.control_points = np.asarray(control_points, dtype="float")
+        self.knots_u = np.asarray(knots_u, dtype="float")
+        self.knots_v = np.asarray(knots_v, dtype="float")
+        self.degree_u = degree_u
+        self.degree_v = degree_v
+
+    @classmethod
+    def fit(cls, points, N_ctrl_u=40, N_ctrl_v=20, degree=3, u=None, v=None):
+        """
+        Least-squares fit of a point grid of shape (N_sections, N_points, N_dim), one
+        linear solve per direction over all the sections / points at once.
+
+        The data parameters default to the normalized arc length along the sections (u)
+        and along the span (v), averaged over the grid. The knots are placed by averaging
+        these parameters so that every knot span holds data, which keeps the fit well
+        conditioned (The NURBS Book, eq. 9.68 and 9.69).
+        """
+        points = np.asarray(points, dtype="float")
+        N_sections, N_points, N_dim = points.shape
+        N_ctrl_u = min(N_ctrl_u, N_points)
+        N_ctrl_v = min(N_ctrl_v, N_sections)
+        degree_u = min(degree, N_ctrl_u - 1)
+        degree_v = min(degree, N_ctrl_v - 1)
+
+        u = _arc_length_parameters(points) if u is None else np.asarray(u)
+        v = _arc_length_parameters(points.transpose(1, 0, 2)) if v is None else np.asarray(v)
+        knots_u = _approximation_knots(u, N_ctrl_u, degree_u)
+        knots_v = _approximation_knots(v, N_ctrl_v, degree_v)
+
+        # along u for all the sections at once, then along v for all the control columns
+        B_u = _basis(knots_u, degree_u, u)
+        B_v = _basis(knots_v, degree_v, v)
+        ctrl = np.linalg.lstsq(B_u, points.transpose(1, 0, 2).reshape(N_points, -1), rcond=None)[0]
+        ctrl = ctrl.reshape(N_ctrl_u, N_sections, N_dim).transpose(1, 0, 2)
+        ctrl = np.linalg.lstsq(B_v, ctrl.reshape(N_sections, -1), rcond=None)[0]
+
+        return cls(ctrl.reshape(N_ctrl_v, N_ctrl_u, N_dim), knots_u, knots_v, degree_u, degree_v)
+
+    def evaluate(self, u, v, grid=True, du=0, dv=0):
+        """
+        Points of the surface, or their partial derivatives of order `du` along u and `dv`
+        along v.
+
+        With `grid=True` the surface is evaluated on the grid of all the (u, v) pairs and
+        the result has shape (len(v), len(u), N_dim), like the point grids. Otherwise u and
+        v are of the same shape and the result has shape (*u.shape, N_dim).
+        """
+        u = np.asarray(u, dtype="float")
+        v = np.asarray(v, dtype="float")
+        B_u = _basis(self.knots_u, self.degree_u, u.ravel(), du)
+        B_v = _basis(self.knots_v, self.degree_v, v.ravel(), dv)
+
+        if grid:
+            return np.einsum("ki,ijd,lj->kld", B_v, self.control_points, B_u, optimize=True)
+        return np.einsum(
+            "ki,ijd,kj->kd", B_v, self.control_points, B_u, optimize=True
+        ).reshape((*u.shape, -1))
+
+    def normals(self, u, v, grid=True):
+        """Unit normals, cross product of the u and v derivatives, same shapes as `evaluate`."""
+        normals = np.cross(
+            self.evaluate(u, v, grid, du=1), self.evaluate(u, v, grid, dv=1)
+        )
+        return normals / np.linalg.norm(normals, axis=-1, keepdims=True)
+
+
+class BladeSurface:
+    """
+    B-spline surface model of both sides of a blade, fitted on the rotor points of a
+    `GeomTurbo` (or any array of shape (2, N_sections, N_points, 3)). Once fitted, the
+    blade can be evaluated at any resolution without the original data.
+
+    The sides keep the order of `rotor_points`, u goes from the leading to the trailing
+    edge and v from the hub to the shroud.
+
+    Example
+    -------
+    >>> surface = BladeSurface(GeomTurbo("blade.geomTurbo").rotor_points)
+    >>> points = surface.resample(N_sections=400, N_points=1000)
+    """
+
+    def __init__(self, rotor_points, N_ctrl_u=40, N_ctrl_v=20, degree=3):
+
+        self.sides = [
+            BSplineSurface.fit(points, N_ctrl_u, N_ctrl_v, degree)
+            for points in rotor_points
+        ]
+
+    def evaluate(self, u, v, grid=True, du=0, dv=0):
+        """Evaluates both sides, see `BSplineSurface.evaluate`, stacked on axis 0."""
+        return np.array([side.evaluate(u, v, grid, du, dv) for side in self.sides])
+
+    def normals(self, u, v, grid=True):
+        """Unit normals of both sides, see `BSplineSurface.normals`, stacked on axis 0."""
+        return np.array([side.normals(u, v, grid) for side in self.sides])
+
+    def resample(self, N_sections=181, N_points=362):
+        """
+        Returns rotor points of shape (2, N_sections, N_points, 3), evenly spaced in the
+        surface parameters.
+        """
+        return self.evaluate(np.linspace(0, 1, N_points), np.linspace(0, 1, N_sections))
+
+    def residuals(self, rotor_points):
+        """
+        Distances from the points of a grid of shape (2, N_sections, N_points, 3) to the
+        surfaces evaluated at the same parameters as in the fit.
+        """
+        residuals = []
+        for side, points in zip(self.sides, rotor_points):
+            points = np.asarray(points, dtype="float")
+            u = _arc_length_parameters(points)
+            v = _arc_length_parameters(points.transpose(1, 0, 2))
+            residuals.append(np.linalg.norm(side.evaluate(u, v) - points, axis=-1))
+        return residuals
+
+
+# Functions used in BSplineSurface.fit and evaluate.
+
+
+def _arc_length_parameters(points):
+    """
+    Normalized arc length along axis 1 of a grid of shape (N_rows, N_points, N_dim),
+    averaged over the rows.
+    """
+    lengths = np.linalg.norm(np.diff(points, axis=1), axis=2)
+    lengths = np.cumsum(np.pad(lengths, ((0, 0), (1, 0))), axis=1)
+    lengths = lengths / np.where(lengths[:, -1:] > 0, lengths[:, -1:], 1)
+    return np.mean(lengths, axis=0)
+
+
+def _approximation_knots(parameters, N_ctrl, degree):
+    """Clamped knot vector whose interior knots are averages of the data parameters."""
+    d = parameters.size / (N_ctrl - degree)
+    j = np.arange(1, N_ctrl - degree)
+    i = (j * d).astype(int)
+    alpha = j * d - i
+    interior = (1 - alpha) * parameters[i - 1] + alpha * parameters[i]
+    return np.concatenate(
+        (np.full(degree + 1, parameters[0]), interior, np.full(degree + 1, parameters[-1]))
+    )
+
+
+def _basis(knots, degree, t, derivative=0):
+    """
+    Values of all the B-spline basis functions, or of their derivatives, at all the
+    parameters t, with the Cox-de Boor recursion carried out on whole arrays.
+
+    Returns:
+        ndarray of shape (len(t), len(knots) - degree - 1)
+    """
+    t = np.asarray(t, dtype="float")
+
+    if derivative > 0:
+        lower = _basis(knots, degree - 1, t, derivative - 1)
+        left = _safe_divide(degree, knots[degree:-1] - knots[: -degree - 1])
+        right = _safe_divide(degree, knots[degree + 1 :] - knots[1:-degree])
+        return lower[:, :-1] * left - lower[:, 1:] * right
+
+    # degree 0, the end of the parameter range belongs to the last non-empty span
+    t = np.clip(t, knots[0], knots[-1])
+    last = np.nonzero(knots[:-1] < knots[-1])[0][-1]
+    N = (knots[:-1] <= t[:, np.newaxis]) & (t[:, np.newaxis] < knots[1:])
+    N[:, last] |= t == knots[-1]
+    N = N.astype("float")
+
+    for p in range(1, degree + 1):
+        left = _safe_divide(t[:, np.newaxis] - knots[: -p - 1], knots[p:-1] - knots[: -p - 1])
+        right = _safe_divide(knots[p + 1 :] - t[:, np.newaxis], knots[p + 1 :] - knots[1:-p])
+        N = left * N[:, :-1] + right * N[:, 1:]
+
+    return N
+
+
+def _safe_divide(a, b):
+    """a / b with 0 wherever b is 0, as in the 0/0 = 0 convention of B-splines."""
+    a, b = np.broadcast_arrays(a, b)
+    return np.divide(a, b, out=np.zeros(a.shape), where=b != 0)
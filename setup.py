@@ -7,5 +7,5 @@ setup(
    author='Jean Fesquet',
    author_email='',
    packages=['parageom'],
-   install_requires=['numpy','matplotlib','parablade', 'geomdl'],
+   install_requires=['numpy','scipy','matplotlib','parablade'],
 )
\ No newline at end of file
@@ -0,0 +1,22 @@
+import os
+
+from parageom.cache import DiskCache
+
+
+def _write(file):
+    with open(file, "w") as f:
+        f.write("entry")
+
+
+def test_disappeared_entries(tmp_path, monkeypatch):
+    cache = DiskCache("test", directory=str(tmp_path))
+    for key in ("a", "b"):
+        cache.put(key, _write)
+    listed = cache.entries()
+
+    # another process removes an entry after it was listed
+    os.remove(os.path.join(cache.directory, listed[0][0]))
+    monkeypatch.setattr(cache, "entries", lambda: listed)
+
+    assert cache.prune() == [listed[1][0]]
+    assert DiskCache("test", directory=str(tmp_path)).entries() == []
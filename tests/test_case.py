@@ -0,0 +1,81 @@
+import os
+import shutil as sh
+
+import numpy as np
+import pytest
+
+pytest.importorskip("parablade")
+
+import parablade.common.config as cfg
+import parablade.init_files.path as pb_path
+
+import parageom.cache
+import parageom.case
+from parageom.case import Case
+from parageom.reader import Param_3D
+
+
+class _BladeMatch:
+    """Stands for `BladeMatch`, writing the cfg it was given as the matched one."""
+
+    runs = 0
+
+    def __init__(self, IN, _output_path=None, **kwargs):
+        self.IN = IN
+        self.output_matching = f"{_output_path}/output_matching"
+
+    def match_blade(self, matching_mode="DVs"):
+        _BladeMatch.runs += 1
+        os.makedirs(self.output_matching, exist_ok=True)
+        with open(f"{self.output_matching}/matched_parametrization.cfg", "w") as f:
+            cfg.WriteBladeConfigFile(f, self.IN)
+        with open(f"{self.output_matching}/optimization_progress.txt", "w") as f:
+            f.write("iteration \t mean \t max \t mean % \t max %\n")
+            f.write("1 \t 1e-06 \t 2e-06 \t 0.01 \t 0.02\n")
+
+
+@pytest.fixture
+def geomTurbo_file(tmp_path):
+    u = np.linspace(0, 1, 40)
+    v = np.linspace(0, 1, 5)[:, np.newaxis]
+    x, z = 40 * u + 0 * v, 100 + 80 * v + 0 * u
+    sides = [
+        np.stack((x, sign * 2 * np.sin(np.pi * u) + 0 * v, z), axis=-1)
+        for sign in (1, -1)
+    ]
+    blade = Param_3D.__new__(Param_3D)
+    blade.split_coordinates = np.stack(sides, axis=1)
+    blade.N_blades = [36]
+    file = str(tmp_path / "blade.geomTurbo")
+    blade.write_geomTurbo(file)
+    return file
+
+
+def test_match_cache_paths(tmp_path, geomTurbo_file, monkeypatch):
+    monkeypatch.setattr(parageom.case, "BladeMatch", _BladeMatch)
+    monkeypatch.setattr(parageom.cache, "DEFAULT_DIR", str(tmp_path / "cache"))
+    template = f"{os.path.dirname(pb_path.__file__)}/compressor.cfg"
+
+    # same geometry and options, only the paths differ
+    runs = []
+    for name in ("first", "second"):
+        os.makedirs(tmp_path / name)
+        sh.copy(geomTurbo_file, tmp_path / name / "blade.geomTurbo")
+        case = Case(
+            str(tmp_path / name / "case"),
+            str(tmp_path / name / "blade.geomTurbo"),
+            interactive=False,
+            auto_concatenate=False,
+            match_cache=True,
+        )
+        case.initialise_case(template)
+        case.match_blade(N_sections=2)
+        runs.append(_BladeMatch.runs)
+
+    assert runs[1] == runs[0], "the second case should only use the cache"
+    for i in range(2):
+        matched = cfg.ReadUserInput(f"{case.output_path}/section_{i:03d}.cfg")
+        for key in ("Config_Path", "PRESCRIBED_BLADE_FILENAME"):
+            path = matched[key]
+            path = path[0] if isinstance(path, list) else path
+            assert os.path.abspath(path).startswith(str(tmp_path / "second"))
@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("matplotlib")
+
+from parageom.common import interp_rows
+
+
+@pytest.mark.parametrize("shared", [True, False])
+def test_interp_rows(shared):
+    rng = np.random.default_rng(0)
+    xp = np.cumsum(rng.uniform(0, 1, (6, 20)), axis=1) + rng.uniform(-5, 5, (6, 1))
+    fp = rng.standard_normal(20 if shared else (6, 20))
+    # beyond both ends of every row, so that a leak into the next row would show
+    x = np.linspace(xp[:, :1] - 3, xp[:, -1:] + 3, 50, axis=1)[..., 0]
+
+    expected = [
+        np.interp(x_row, xp_row, fp_row)
+        for x_row, xp_row, fp_row in zip(x, xp, np.broadcast_to(fp, xp.shape))
+    ]
+    np.testing.assert_allclose(interp_rows(x, xp, fp), expected, rtol=0, atol=1e-12)
@@ -0,0 +1,61 @@
+import warnings
+
+import numpy as np
+import pytest
+
+pytest.importorskip("parablade")
+
+from parageom.reader import BladeEvaluator, Param_3D
+
+
+class _Blade:
+    """Stands for a built `pb.Blade3D`, evaluating (u, v) pairs point by point."""
+
+    IN = {"N_BLADES": [36]}
+
+    def get_section_coordinates(self, u, v):
+        u, v = np.broadcast_arrays(np.asarray(u, dtype="float"), v)
+        t = np.abs(2 * u - 1)
+        return np.array([40 * (1 + v) * t, np.sin(np.pi * u) * (1 + v), 100 + 80 * v])
+
+
+class _SectionBlade(_Blade):
+    """Only evaluates one section per call, as with a scalar v."""
+
+    def get_section_coordinates(self, u, v):
+        return super().get_section_coordinates(u, np.ravel(v)[0])
+
+
+@pytest.mark.parametrize("chunk_size", [None, 7])
+def test_batch(chunk_size):
+    reference = Param_3D(None, 21, 40, blade=_Blade())
+    blade = Param_3D(None, 21, 40, batch=True, chunk_size=chunk_size, blade=_Blade())
+
+    assert blade.batch
+    np.testing.assert_allclose(blade.blade_coordinates, reference.blade_coordinates)
+
+
+def test_batch_fallback():
+    reference = Param_3D(None, 21, 40, blade=_SectionBlade())
+    with pytest.warns(UserWarning):
+        blade = Param_3D(None, 21, 40, batch=True, blade=_SectionBlade())
+
+    assert not blade.batch
+    np.testing.assert_array_equal(blade.blade_coordinates, reference.blade_coordinates)
+
+
+@pytest.mark.parametrize("blade", [_Blade(), _SectionBlade()])
+@pytest.mark.parametrize("batch", [False, True])
+def test_evaluator(blade, batch):
+    evaluator = BladeEvaluator.__new__(BladeEvaluator)
+    evaluator.blade = blade
+    evaluator.batch = batch
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        params = evaluator.evaluate([(11, 20), (21, 40)])
+
+    for param, resolution in zip(params, [(11, 20), (21, 40)]):
+        reference = Param_3D(None, *resolution, blade=blade)
+        np.testing.assert_allclose(param.blade_coordinates, reference.blade_coordinates)
+    assert evaluator.evaluate([]) == []
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("parablade")
+
+from parageom.cache import DiskCache
+from parageom.reader import GeomTurbo
+
+
+def _block(points):
+    return [" ".join(repr(float(x)) for x in point) for point in points]
+
+
+@pytest.fixture
+def unsectioned_file(tmp_path):
+    """Unsectioned geomTurbo file with a rotor and a stator whose edges differ in size."""
+    rng = np.random.default_rng(0)
+    lines = ["GEOMETRY TURBO", "VERSION 5.5"]
+    for N_le, N_te in ((30, 30), (20, 25)):
+        lines += ["NI_BEGIN le", "XYZ", *_block(rng.normal(size=(N_le, 3))), "NI_END le"]
+        lines += ["NI_BEGIN te", "XYZ", *_block(rng.normal(size=(N_te, 3))), "NI_END te"]
+    lines += ["NI_END GEOMTURBO", "curve", "ZRCURVE", *_block(rng.normal(size=(10, 3)))]
+    for shape in ((7, 5), (7, 5)):
+        lines += ["surface", f"4 4 {shape[0]} {shape[1]} 0", "SISLS", "0 0 0 0 1 1 1 1"]
+        lines += _block(rng.normal(size=(shape[0] * shape[1], 3)))
+
+    file = str(tmp_path / "blade.geomTurbo")
+    with open(file, "w") as f:
+        f.write("\n".join(lines) + "\n")
+    return file
+
+
+def _assert_equal(value, expected):
+    if isinstance(expected, list):
+        assert isinstance(value, list) and len(value) == len(expected)
+        for element, expected_element in zip(value, expected):
+            _assert_equal(element, expected_element)
+    else:
+        np.testing.assert_array_equal(value, expected)
+
+
+def test_unsectioned_cache(tmp_path, unsectioned_file):
+    cache = DiskCache("geomTurbo", directory=str(tmp_path / "cache"))
+    expected = GeomTurbo(unsectioned_file, init="unsectioned")
+
+    for _ in range(2):
+        geomTurbo = GeomTurbo(unsectioned_file, init="unsectioned", cache=cache)
+        assert len(geomTurbo.edges) == 2
+        for name in ("edges", "rotor_edges", "stator_edges", "curves", "surfaces"):
+            _assert_equal(getattr(geomTurbo, name), getattr(expected, name))
+    assert cache.hits == 2
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("matplotlib")
+
+from parageom.rotor import Rotor, span_weights
+
+
+def _rotor(section_coordinates, scale_factor=1):
+    """`Rotor` holding already computed sections, without an initializer."""
+    rotor = Rotor.__new__(Rotor)
+    rotor._section_coordinates = section_coordinates
+    rotor.scale_factor = scale_factor
+    rotor.N_sections = section_coordinates.shape[0]
+    return rotor
+
+
+def _str_export(section, file, dim):
+    """Writes a section the way `Rotor.parablade_section_export` used to, one point at a
+    time with str()."""
+    with open(file, "a") as f:
+        if dim == "2D":
+            f.writelines(
+                [
+                    f"{i}\t{section.T[2, i]}\t{section.T[0, i]}\n"
+                    for i in range(len(section))
+                ]
+            )
+        else:
+            f.writelines(
+                [
+                    f"{i}\t{section.T[0, i]}\t{section.T[1, i]}\t{section.T[2, i]}\n"
+                    for i in range(len(section))
+                ]
+            )
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float64"])
+@pytest.mark.parametrize("dim", ["2D", "3D"])
+def test_export_matches_str(tmp_path, dtype, dim):
+    rng = np.random.default_rng(0)
+    sections = rng.standard_normal((5, 40, 3)) * 10.0 ** rng.integers(-6, 6, (5, 40, 3))
+    rotor = _rotor(sections.astype(dtype), scale_factor=1e-3)
+
+    for i in (1, 3):
+        section = rotor.section_coordinates[i] * rotor.scale_factor
+        _str_export(section, tmp_path / "str", dim)
+    rotor.export(tmp_path / "export", [1, 3], dim=dim)
+
+    assert (tmp_path / "export").read_text() == (tmp_path / "str").read_text()
+
+
+def test_export_unknown_dim(tmp_path):
+    with pytest.raises(ValueError):
+        _rotor(np.zeros((2, 4, 3))).export(tmp_path / "export", dim="2d")
+
+
+def test_span_weights_single_section():
+    i, j, w = span_weights(np.zeros(1), [0, 0.5, 1])
+    assert np.all(i == 0) and np.all(j == 0) and np.all(w == 0)
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("parablade")
+
+from parageom.reader import GeomTurbo, Param_3D
+
+
+def _param_3D(split_coordinates, N_blades):
+    """`Param_3D` holding already computed coordinates, without building a blade."""
+    blade = Param_3D.__new__(Param_3D)
+    blade.split_coordinates = split_coordinates
+    blade.N_blades = N_blades
+    return blade
+
+
+@pytest.fixture
+def split_coordinates():
+    """Coordinates of shape (N_sections, 2, N_points, 3), suction then pressure side."""
+    rng = np.random.default_rng(0)
+    u = np.linspace(0, 1, 50)
+    v = np.linspace(0, 1, 7)[:, np.newaxis]
+    sides = [
+        np.stack(
+            (
+                0.05 * u + 0 * v,
+                sign * 0.004 * np.sin(np.pi * u) + 0.01 * v,
+                0.1 + 0.03 * v + 0 * u,
+            ),
+            axis=-1,
+        )
+        for sign in (1, -1)
+    ]
+    return np.stack(sides, axis=1) * (1 + 1e-3 * rng.standard_normal((7, 2, 50, 3)))
+
+
+@pytest.mark.parametrize("precision", [None, 10, 6])
+def test_round_trip(tmp_path, split_coordinates, precision):
+    file = str(tmp_path / "blade.geomTurbo")
+    _param_3D(split_coordinates, [17]).write_geomTurbo(file, precision=precision)
+
+    geomTurbo = GeomTurbo(file)
+    expected = np.swapaxes(split_coordinates, 0, 1)
+
+    assert geomTurbo.n_blades == 17
+    assert geomTurbo.sides == ["suction", "pressure"]
+    assert geomTurbo.rotor_points.shape == expected.shape
+    if precision is None:
+        np.testing.assert_array_equal(geomTurbo.rotor_points, expected)
+    else:
+        # %.{precision}g rounds to half a unit of the last significant digit
+        np.testing.assert_allclose(
+            geomTurbo.rotor_points, expected, rtol=0.5 * 10 ** (1 - precision), atol=0
+        )
+
+
+def test_header(tmp_path, split_coordinates):
+    file = str(tmp_path / "blade.geomTurbo")
+    _param_3D(split_coordinates, [17]).write_geomTurbo(file, precision=6)
+
+    with open(file, "r") as f:
+        lines = f.read().splitlines()
+
+    assert lines[:5] == [
+        "GEOMETRY TURBO VERSION 5",
+        "number_of_blades 17",
+        "blade_expansion_factor_hub  0.01",
+        "blade_expansion_factor_shroud 0.01",
+        "blade_tangential_definition\t  0",
+    ]
+    assert lines[5:8] == ["suction", "SECTIONAL", "7"]
+    assert "pressure" in lines